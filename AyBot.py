@@ -1,146 +1,167 @@
-import aiohttp
+import time
+STARTUP_BEGIN = time.perf_counter()
+
 import asyncio
 import signal
 import sys
 import platform
 import os
-import mysql.connector
-import sqlite3
+import argparse
 from utils import config, logger
-from database import mysql_handler
-from core.scheduler import main_worker
-from core.crawler import parse_sitemap
-from datetime import datetime
+from database import mysql_handler, migrations, search_index
 from urllib.parse import urlparse
 
+IMPORT_SECONDS = time.perf_counter() - STARTUP_BEGIN
+
 def graceful_exit(signum, frame):
     logger.logger.info("Bot güvenli şekilde durduruluyor...")
     sys.exit(0)
 
 signal.signal(signal.SIGINT, graceful_exit)
 
-async def main_async():
-    logger.logger.info("=== AyBot v6.0 - Gelişmiş Sürekli Tarama Motoru ===")
-    logger.logger.info(f"Veri depolama: {os.path.abspath('data')}")
-    logger.logger.info(f"Sistem: {platform.system()} {platform.release()}")
-    
-    # MySQL tablolarını oluştur
+def init_sqlite():
+    try:
+        migrations.migrate_sqlite()
+    except Exception as e:
+        logger.logger.critical("SQLite migration hatası: %s", e, exc_info=True)
+        sys.exit(1)
+
+def seed_start_urls():
     conn = None
     try:
-        conn = mysql_handler.mysql_pool.get_connection()
+        conn = mysql_handler.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS bots (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                url VARCHAR(2048) NOT NULL UNIQUE,
-                in_progress BOOLEAN NOT NULL DEFAULT 0,
-                visited BOOLEAN NOT NULL DEFAULT 0,
-                error_count INT NOT NULL DEFAULT 0,
-                last_crawled DATETIME,
-                last_error DATETIME,
-                domain VARCHAR(255)
-            )
-        """)
+        # COUNT(*) büyük InnoDB tablosunu baştan sona tarar; boşluk kontrolü için tek satır yeterli
+        cursor.execute("SELECT 1 FROM bots LIMIT 1")
+        if cursor.fetchone():
+            return
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS domain_counters (
-                domain VARCHAR(255) NOT NULL PRIMARY KEY,
-                count INT NOT NULL DEFAULT 0,
-                last_updated DATE NOT NULL,
-                is_whitelisted BOOLEAN DEFAULT 0
+        start_urls = [
+            "https://www.wikipedia.org/",
+            "https://simple.wikipedia.org/",
+            "https://www.bbc.com/",
+            "https://www.archive.org",
+            "https://www.arxiv.org/"
+        ]
+        for url in start_urls:
+            domain = urlparse(url).netloc
+            cursor.execute(
+                "INSERT IGNORE INTO bots (url, domain) VALUES (%s, %s)",
+                (url, domain)
             )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS error_logs (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                url VARCHAR(2048),
-                error_type VARCHAR(255),
-                error_message TEXT,
-                timestamp DATETIME
-            )
-        """)
-        
-        try:
-            cursor.execute("ALTER TABLE bots ADD COLUMN domain VARCHAR(255)")
-        except mysql.connector.Error as err:
-            if err.errno != 1060:  # Column already exists
-                logger.logger.error(f"MySQL domain sütunu ekleme hatası: {err}")
-        
-        cursor.execute("""
-            UPDATE bots 
-            SET domain = SUBSTRING_INDEX(SUBSTRING_INDEX(url, '://', -1), '/', 1)
-            WHERE domain IS NULL
-        """)
-        
-        for domain_ext in config.WHITELISTED_DOMAINS:
-            cursor.execute("""
-                UPDATE domain_counters 
-                SET is_whitelisted = 1 
-                WHERE domain LIKE %s
-            """, (f'%{domain_ext}',))
-        
         conn.commit()
-        logger.logger.info("MySQL tabloları başarıyla kontrol edildi")
-        
-        cursor.execute("SELECT COUNT(*) FROM bots")
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
-            start_urls = [
-                "https://www.wikipedia.org/",
-                "https://simple.wikipedia.org/",
-                "https://www.bbc.com/",
-                "https://www.archive.org",
-                "https://www.arxiv.org/"
-            ]
-            for url in start_urls:
-                domain = urlparse(url).netloc
-                cursor.execute(
-                    "INSERT IGNORE INTO bots (url, domain) VALUES (%s, %s)",
-                    (url, domain)
-                )
-            conn.commit()
-            logger.logger.info(f"Başlangıç URL'leri eklendi: {start_urls}")
-            
-    except Exception as e:
-        logger.logger.critical(f"MySQL tablo hatası: {str(e)}", exc_info=True)
-        sys.exit(1)
+        logger.logger.info("Başlangıç URL'leri eklendi: %s", start_urls)
     finally:
         if conn:
             conn.close()
+
+async def main_async():
+    logger.logger.info("=== AyBot v6.0 - Gelişmiş Sürekli Tarama Motoru ===")
+    logger.logger.info("Veri depolama: %s", os.path.abspath('data'))
+    logger.logger.info("Sistem: %s %s", platform.system(), platform.release())
     
-    # SQLite tablosunu oluştur
-    sqlite_conn = None
+    timings = [("importlar", IMPORT_SECONDS)]
+    
+    phase_start = time.perf_counter()
     try:
-        sqlite_conn = sqlite3.connect(config.SQLITE_DB_PATH, timeout=30)
-        sqlite_conn.execute("PRAGMA journal_mode = WAL")
-        cursor = sqlite_conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT UNIQUE,
-                title TEXT,
-                content TEXT,
-                language TEXT,
-                timestamp TEXT,
-                analyzed BOOLEAN DEFAULT 0
-            )
-        """)
-        sqlite_conn.commit()
-        logger.logger.info("SQLite tablosu başarıyla kontrol edildi")
+        migrations.migrate_mysql()
+        seed_start_urls()
     except Exception as e:
-        logger.logger.critical(f"SQLite tablo hatası: {str(e)}", exc_info=True)
+        logger.logger.critical("MySQL tablo hatası: %s", e, exc_info=True)
         sys.exit(1)
-    finally:
-        if sqlite_conn:
-            sqlite_conn.close()
+    timings.append(("MySQL şema", time.perf_counter() - phase_start))
+    
+    phase_start = time.perf_counter()
+    init_sqlite()
+    timings.append(("SQLite şema", time.perf_counter() - phase_start))
+    
+    phase_start = time.perf_counter()
+    from core.scheduler import main_worker, load_state
+    timings.append(("tarama modülleri", time.perf_counter() - phase_start))
+    
+    phase_start = time.perf_counter()
+    await load_state()
+    timings.append(("durum yükleme", time.perf_counter() - phase_start))
+    
+    report = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings)
+    logger.logger.info("Başlangıç süresi %.2fs (%s)", time.perf_counter() - STARTUP_BEGIN, report)
     
     await main_worker()
 
-if __name__ == '__main__':
+def main():
+    parser = argparse.ArgumentParser(description="AyBot web tarayıcı")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("crawl", help="Sürekli taramayı başlat (varsayılan)")
+    reprocess_parser = subparsers.add_parser(
+        "reprocess",
+        help="Capture segmentlerindeki ham yanıtları ağa çıkmadan yeniden işle"
+    )
+    reprocess_parser.add_argument("--dir", default=config.CAPTURE_DIR, help="Segment klasörü")
+    subparsers.add_parser("index", help="İndekslenmemiş sayfaları arama indeksine ekle")
+    search_parser = subparsers.add_parser("search", help="Taranan sayfalarda BM25 sıralı arama yap")
+    search_parser.add_argument("query", help="Arama sorgusu")
+    search_parser.add_argument("--limit", type=int, default=10, help="Sonuç sayısı")
+    seeds_parser = subparsers.add_parser(
+        "import-seeds",
+        help="Düz metin veya gzip dosyasındaki URL'leri frontier'a toplu ekle"
+    )
+    seeds_parser.add_argument("file", help="Her satırda bir URL ('-' = stdin)")
+    export_parser = subparsers.add_parser("export-frontier", help="Frontier durumunu checkpoint dosyasına yaz")
+    export_parser.add_argument("file", help="Hedef dosya (.gz uzantısı sıkıştırır)")
+    restore_parser = subparsers.add_parser("restore-frontier", help="Checkpoint dosyasından frontier'ı geri yükle")
+    restore_parser.add_argument("file", help="export-frontier çıktısı")
+    pages_parser = subparsers.add_parser(
+        "export-pages",
+        help="Yeni sayfaları sıkıştırılmış JSONL/Parquet dosyalarına artımlı olarak aktar"
+    )
+    pages_parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl", help="Çıktı biçimi")
+    pages_parser.add_argument("--dir", default=config.PAGE_EXPORT_DIR, help="Çıktı klasörü")
+    args = parser.parse_args()
+    
+    if args.command in ("import-seeds", "export-frontier", "restore-frontier"):
+        from database import frontier_io
+        try:
+            migrations.migrate_mysql()
+        except Exception as e:
+            logger.logger.critical("MySQL tablo hatası: %s", e, exc_info=True)
+            sys.exit(1)
+        
+        if args.command == "import-seeds":
+            frontier_io.import_seeds(args.file)
+        elif args.command == "export-frontier":
+            frontier_io.export_frontier(args.file)
+        else:
+            frontier_io.restore_frontier(args.file)
+        return
+    
+    if args.command == "reprocess":
+        from core.capture import reprocess_capture
+        init_sqlite()
+        reprocess_capture(args.dir)
+        return
+    
+    if args.command == "index":
+        init_sqlite()
+        search_index.index_pending()
+        return
+    
+    if args.command == "export-pages":
+        from database import page_export
+        init_sqlite()
+        page_export.export_pages(args.dir, args.format)
+        return
+    
+    if args.command == "search":
+        init_sqlite()
+        for result in search_index.search(args.query, limit=args.limit):
+            print(f"{result['score']:.3f}  {result['url']}\n        {result['title']}\n        {result['snippet']}")
+        return
+    
     if platform.system() == 'Windows':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
     
-    asyncio.run(main_async())
\ No newline at end of file
+    asyncio.run(main_async())
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,129 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import aiohttp
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import MAX_CONCURRENT_REQUESTS, REQUEST_TIMEOUT, ROBOTS_TIMEOUT
+from core.resolver import CachingResolver, create_connector
+
+DEFAULT_URLS = [
+    'https://www.haberler.com/',
+    'https://www.haberler.com/guncel/',
+    'https://www.haberler.com/ekonomi/',
+    'https://www.meb.gov.tr/',
+    'https://www.tbb.org.tr/',
+    'https://www.python.org/',
+    'https://docs.python.org/3/',
+    'https://www.wikipedia.org/',
+]
+
+def trace_config(timings):
+    # Her istek için DNS, bağlantı kurma ve toplam süre ölçülür
+    config = aiohttp.TraceConfig()
+
+    async def request_start(session, ctx, params):
+        ctx.timing = {'started': time.perf_counter(), 'dns': 0.0, 'connect': 0.0, 'reused': False}
+
+    async def dns_start(session, ctx, params):
+        ctx.dns_started = time.perf_counter()
+
+    async def dns_end(session, ctx, params):
+        ctx.timing['dns'] += time.perf_counter() - ctx.dns_started
+
+    async def connect_start(session, ctx, params):
+        ctx.connect_started = time.perf_counter()
+
+    async def connect_end(session, ctx, params):
+        ctx.timing['connect'] += time.perf_counter() - ctx.connect_started
+
+    async def reuse(session, ctx, params):
+        ctx.timing['reused'] = True
+
+    async def request_end(session, ctx, params):
+        ctx.timing['total'] = time.perf_counter() - ctx.timing['started']
+        timings.append(ctx.timing)
+
+    config.on_request_start.append(request_start)
+    config.on_dns_resolvehost_start.append(dns_start)
+    config.on_dns_resolvehost_end.append(dns_end)
+    config.on_connection_create_start.append(connect_start)
+    config.on_connection_create_end.append(connect_end)
+    config.on_connection_reuseconn.append(reuse)
+    config.on_request_end.append(request_end)
+    config.on_request_exception.append(request_end)
+    return config
+
+async def fetch(session, semaphore, url):
+    # Crawler'daki sıra: önce robots.txt, sonra sayfa
+    parsed = urlparse(url)
+    async with semaphore:
+        for target, timeout in ((f"{parsed.scheme}://{parsed.netloc}/robots.txt", ROBOTS_TIMEOUT), (url, REQUEST_TIMEOUT)):
+            try:
+                async with session.get(target, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+async def run(name, connector, urls, rounds):
+    timings = []
+    session = aiohttp.ClientSession(connector=connector, trace_configs=[trace_config(timings)])
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    try:
+        for _ in range(rounds):
+            await asyncio.gather(*(fetch(session, semaphore, url) for url in urls))
+    finally:
+        await session.close()
+    report(name, timings)
+
+def percentile(values, ratio):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+def report(name, timings):
+    if not timings:
+        print(f"{name:<28} istek yok")
+        return
+
+    # Yeniden kullanılan bağlantılarda DNS ve bağlantı kurma adımı hiç çalışmaz
+    dns = [t['dns'] * 1000 for t in timings]
+    connect = [t['connect'] * 1000 for t in timings]
+    total = [t.get('total', 0) * 1000 for t in timings]
+    reused = sum(t['reused'] for t in timings)
+    print(f"{name:<28} {len(timings):5d} istek  "
+          f"DNS ort {statistics.mean(dns):7.2f} ms p95 {percentile(dns, 0.95):7.2f} ms  "
+          f"bağlantı ort {statistics.mean(connect):7.2f} ms p95 {percentile(connect, 0.95):7.2f} ms  "
+          f"toplam ort {statistics.mean(total):7.1f} ms  "
+          f"yeniden kullanım %{reused / len(timings) * 100:.0f}")
+
+async def main_async(urls, rounds):
+    print(f"{len(urls)} URL x {rounds} tur (robots.txt + sayfa), istek başına süreler:")
+    await run("varsayılan TCPConnector", aiohttp.TCPConnector(limit_per_host=5), urls, rounds)
+
+    resolver = CachingResolver()
+    try:
+        await run("DNS önbelleği + keep-alive", create_connector(resolver), urls, rounds)
+    finally:
+        await resolver.close()
+    print(f"DNS önbelleği: {resolver.stats()}")
+
+def main():
+    parser = argparse.ArgumentParser(description="İstek başına DNS ve bağlantı kurma süresi ölçümü")
+    parser.add_argument('urls', nargs='*', help="Ölçülecek URL'ler (boşsa örnek liste)")
+    parser.add_argument('--file', help="Satır başına bir URL içeren dosya")
+    parser.add_argument('--rounds', type=int, default=3, help="Her URL kaç tur çekilecek")
+    args = parser.parse_args()
+
+    urls = list(args.urls)
+    if args.file:
+        with open(args.file, encoding='utf-8') as source:
+            urls += [line.strip() for line in source if line.strip() and not line.startswith('#')]
+    asyncio.run(main_async(urls or DEFAULT_URLS, args.rounds))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+import logging
+import tempfile
+from logging.handlers import RotatingFileHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import setup_logger, shutdown_logging
+
+URL_COUNT = 20000
+LINES_PER_URL = 4
+
+def sync_logger(path):
+    # Eski kurulum: senkron RotatingFileHandler + f-string
+    logger = logging.getLogger('bench-sync')
+    logger.setLevel(logging.INFO)
+    handler = RotatingFileHandler(path, maxBytes=10*1024*1024, backupCount=2)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s'))
+    logger.addHandler(handler)
+    return logger
+
+def run_fstring(logger):
+    for i in range(URL_COUNT):
+        url = f"https://example.com/page/{i}"
+        logger.info(f"İşleniyor: {url}")
+        logger.info(f"Tarama başladı: {url}")
+        logger.info(f"{i % 50} yeni link bulundu")
+        logger.info(f"İşlem tamamlandı: {url}")
+
+def run_lazy(logger):
+    for i in range(URL_COUNT):
+        url = f"https://example.com/page/{i}"
+        logger.info("İşleniyor: %s", url)
+        logger.info("Tarama başladı: %s", url)
+        logger.info("%s yeni link bulundu", i % 50)
+        logger.info("İşlem tamamlandı: %s", url)
+
+def measure(name, func, logger, drain=None):
+    started = time.perf_counter()
+    func(logger)
+    caller = time.perf_counter() - started
+    drained = 0.0
+    if drain:
+        started = time.perf_counter()
+        drain()
+        drained = time.perf_counter() - started
+
+    calls = URL_COUNT * LINES_PER_URL
+    print(f"{name:<34} {caller / calls * 1e6:8.2f} µs/çağrı  "
+          f"{caller / URL_COUNT * 1e6:8.2f} µs/sayfa  "
+          f"(kuyruk boşaltma {drained:.2f}s)")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{URL_COUNT} sayfa x {LINES_PER_URL} INFO satırı, event loop thread'indeki maliyet:")
+        measure("senkron dosya + f-string", run_fstring, sync_logger(os.path.join(tmp, 'sync.log')))
+
+        queued = setup_logger('bench-queue', os.path.join(tmp, 'queue.log'), console=False)
+        queued.filters.clear()
+        measure("kuyruk + %-biçim (örneklemesiz)", run_lazy, queued, shutdown_logging)
+
+        sampled = setup_logger('bench-sampled', os.path.join(tmp, 'sampled.log'), console=False)
+        measure("kuyruk + %-biçim + örnekleme", run_lazy, sampled, shutdown_logging)
+
+        json_logger = setup_logger('bench-json', os.path.join(tmp, 'json.log'), log_format='json', console=False)
+        json_logger.filters.clear()
+        measure("kuyruk + JSON (örneklemesiz)", run_lazy, json_logger, shutdown_logging)
+
+if __name__ == '__main__':
+    main()
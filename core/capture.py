@@ -0,0 +1,216 @@
+import os
+import gzip
+import glob
+import mmap
+import uuid
+import zlib
+import threading
+from datetime import datetime
+from .parser import extract_content
+from .near_duplicates import near_duplicates, compute_simhash, to_signed
+from utils.helpers import is_spam
+from utils.logger import logger
+from utils.config import CAPTURE_DIR, CAPTURE_SEGMENT_MAX_BYTES, MIN_CONTENT_LENGTH
+from database import sqlite_handler
+
+# aiohttp gövdeyi açılmış olarak verdiği için bu başlıklar kayda yazılmaz
+SKIPPED_HEADERS = {b'content-encoding', b'transfer-encoding', b'content-length'}
+
+class CaptureWriter:
+    def __init__(self, directory=CAPTURE_DIR, max_bytes=CAPTURE_SEGMENT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment = None
+        self.index = None
+        self.offset = 0
+        self.sequence = 0
+        # write() crawler'dan thread'de çağrılır; segment ofseti ve .idx tek yazarla tutarlı kalır
+        self.lock = threading.Lock()
+
+    def _open_segment(self):
+        self._close()
+        os.makedirs(self.directory, exist_ok=True)
+        self.sequence += 1
+        name = f"aybot-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{self.sequence:05d}.warc.gz"
+        path = os.path.join(self.directory, name)
+        self.segment = open(path, 'ab')
+        self.index = open(path + '.idx', 'a', encoding='utf-8')
+        self.offset = self.segment.tell()
+        logger.info("Yeni capture segmenti: %s", path)
+
+    def write(self, url, status, reason, raw_headers, body):
+        http_head = [f"HTTP/1.1 {status} {reason or ''}".encode('latin-1', 'replace')]
+        for name, value in raw_headers:
+            if name.lower() not in SKIPPED_HEADERS:
+                http_head.append(name + b': ' + value)
+        http_head.append(f"Content-Length: {len(body)}".encode('ascii'))
+        http_block = b'\r\n'.join(http_head) + b'\r\n\r\n' + body
+
+        warc_head = (
+            "WARC/1.0\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            "Content-Type: application/http; msgtype=response\r\n"
+            f"Content-Length: {len(http_block)}\r\n\r\n"
+        ).encode('utf-8')
+
+        # Her kayıt ayrı bir gzip üyesi; segment standart .warc.gz olarak da okunabilir
+        # Sıkıştırma kilit dışında yapılır, yalnızca dosyaya ekleme sıralanır
+        record = gzip.compress(warc_head + http_block + b'\r\n\r\n', compresslevel=6)
+        with self.lock:
+            if self.segment is None or self.offset >= self.max_bytes:
+                self._open_segment()
+            self.segment.write(record)
+            self.segment.flush()
+            self.index.write(f"{self.offset}\t{len(record)}\t{url}\n")
+            self.index.flush()
+            self.offset += len(record)
+
+    def close(self):
+        with self.lock:
+            self._close()
+
+    def _close(self):
+        if self.segment:
+            self.segment.close()
+            self.segment = None
+        if self.index:
+            self.index.close()
+            self.index = None
+
+def parse_record(data):
+    warc_head, _, block = data.partition(b'\r\n\r\n')
+    warc_fields = {}
+    for line in warc_head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        warc_fields[name.strip().lower().decode('latin-1')] = value.strip().decode('utf-8', 'replace')
+
+    if block.endswith(b'\r\n\r\n'):
+        block = block[:-4]
+    http_head, _, body = block.partition(b'\r\n\r\n')
+    lines = http_head.split(b'\r\n')
+    status_parts = lines[0].split(b' ', 2)
+    status = int(status_parts[1]) if len(status_parts) > 1 and status_parts[1].isdigit() else 0
+
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(b':')
+        headers[name.strip().lower().decode('latin-1')] = value.strip().decode('latin-1')
+
+    return {
+        'url': warc_fields.get('warc-target-uri'),
+        'date': warc_fields.get('warc-date'),
+        'status': status,
+        'headers': headers,
+        'body': body
+    }
+
+class CaptureReader:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.mm:
+            self.mm.close()
+            self.mm = None
+        self.file.close()
+
+    def offsets(self):
+        index_path = self.path + '.idx'
+        if os.path.exists(index_path):
+            with open(index_path, encoding='utf-8') as index:
+                for line in index:
+                    parts = line.rstrip('\n').split('\t', 2)
+                    if len(parts) == 3:
+                        offset, length = int(parts[0]), int(parts[1])
+                        if offset + length <= self.size:
+                            yield offset, length
+            return
+
+        # İndeks yoksa gzip üye sınırları sırayla çözülerek bulunur
+        offset = 0
+        while self.mm is not None and offset < self.size:
+            decompressor = zlib.decompressobj(wbits=31)
+            position = offset
+            while not decompressor.eof and position < self.size:
+                chunk = self.mm[position:position + 65536]
+                decompressor.decompress(chunk)
+                position += len(chunk)
+            if not decompressor.eof:
+                break
+            length = position - offset - len(decompressor.unused_data)
+            yield offset, length
+            offset += length
+
+    def read(self, offset, length):
+        return parse_record(gzip.decompress(self.mm[offset:offset + length]))
+
+    def __iter__(self):
+        if self.mm is None:
+            return
+        for offset, length in self.offsets():
+            try:
+                yield self.read(offset, length)
+            except (OSError, EOFError, zlib.error) as e:
+                logger.warning("Bozuk capture kaydı: %s@%s - %s", self.path, offset, e)
+
+def decode_body(record):
+    charset = 'utf-8'
+    content_type = record['headers'].get('content-type', '')
+    for part in content_type.split(';'):
+        part = part.strip()
+        if part.lower().startswith('charset='):
+            charset = part.split('=', 1)[1].strip('"\' ') or charset
+    try:
+        return record['body'].decode(charset, errors='replace')
+    except LookupError:
+        return record['body'].decode('utf-8', errors='replace')
+
+def reprocess_capture(directory=CAPTURE_DIR):
+    segments = sorted(glob.glob(os.path.join(directory, '*.warc.gz')))
+    logger.info("Capture yeniden işleme başladı: %s segment", len(segments))
+    # Canlı taramadaki gibi yakın kopyalar atlanır; aksi halde ayna sayfalar pages'e geri döner
+    if not near_duplicates.loaded:
+        near_duplicates.load()
+
+    total = saved = duplicates = 0
+    for segment in segments:
+        with CaptureReader(segment) as reader:
+            for record in reader:
+                total += 1
+                if record['status'] != 200 or not record['url']:
+                    continue
+
+                title, text, lang, _ = extract_content(decode_body(record))
+                if not title or len(text) < MIN_CONTENT_LENGTH or is_spam(text):
+                    continue
+
+                simhash = compute_simhash(text)
+                duplicate_of = near_duplicates.find(simhash, exclude_url=record['url'])
+                if duplicate_of:
+                    logger.debug("Yakın kopya sayfa atlandı: %s ~ %s", record['url'], duplicate_of)
+                    duplicates += 1
+                    continue
+
+                near_duplicates.add(record['url'], simhash)
+                sqlite_handler.save_to_sqlite(
+                    record['url'], title, text, lang, record['date'], to_signed(simhash)
+                )
+                saved += 1
+
+    logger.info("Capture yeniden işleme tamamlandı: %s kayıt okundu, %s sayfa kaydedildi, %s yakın kopya atlandı",
+                total, saved, duplicates)
+    return total, saved
+
+capture_writer = CaptureWriter()
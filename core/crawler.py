@@ -5,18 +5,18 @@ from .parser import extract_links, extract_content
 from .renderer import fetch_with_js
 from utils.helpers import is_spam, normalize_url
 from utils.logger import logger
-from utils.config import MIN_CONTENT_LENGTH, JS_RENDER_THRESHOLD, REQUEST_TIMEOUT, USER_AGENTS, ROBOTS_TIMEOUT
+from utils.config import MIN_CONTENT_LENGTH, JS_RENDER_THRESHOLD, REQUEST_TIMEOUT, USER_AGENTS, ROBOTS_TIMEOUT, CAPTURE_ENABLED
 from database import sqlite_handler
 from database import mysql_handler
+from .recrawl import content_fingerprint, schedule_next_fetch
+from .capture import capture_writer
+from .link_graph import edge_writer
+from .near_duplicates import near_duplicates, compute_simhash, to_signed
+from .retry_queue import FetchError, parse_retry_after, retry_queue
+from .host_health import host_health
 from datetime import datetime
-from tenacity import retry, wait_exponential, stop_after_attempt
 from urllib.parse import urlparse
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    stop=stop_after_attempt(2),
-    reraise=True
-)
 async def can_fetch(session, url):
     try:
         parsed = urlparse(url)
@@ -49,15 +49,15 @@ async def can_fetch(session, url):
                     
                     for dis_path in disallowed:
                         if parsed.path.startswith(dis_path):
-                            logger.info(f"Robots.txt engelledi: {url} (Path: {dis_path})")
+                            logger.info("Robots.txt engelledi: %s (Path: %s)", url, dis_path)
                             return False
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-            logger.debug(f"Robots.txt hatası: {robots_url} - {str(e)}")
+            logger.debug("Robots.txt hatası: %s - %s", robots_url, e)
             return True
         
         return True
     except Exception as e:
-        logger.error(f"Robots.txt kontrol hatası: {str(e)}", exc_info=True)
+        logger.error("Robots.txt kontrol hatası: %s", e, exc_info=True)
         return True
 
 async def parse_sitemap(session, domain):
@@ -91,19 +91,14 @@ async def parse_sitemap(session, domain):
                                 if is_valid_link(url):
                                     found_links.add(url)
         except Exception as e:
-            logger.debug(f"Sitemap hatası: {sitemap_url} - {str(e)}")
+            logger.debug("Sitemap hatası: %s - %s", sitemap_url, e)
             continue
     
     return found_links
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    stop=stop_after_attempt(2),
-    reraise=True
-)
 async def crawl_page(session, url):
     try:
-        logger.info(f"Tarama başladı: {url}")
+        logger.info("Tarama başladı: %s", url)
         
         if not await can_fetch(session, url):
             return [], None, None, None, None
@@ -126,31 +121,46 @@ async def crawl_page(session, url):
                 headers=headers, 
                 timeout=timeout,
             ) as response:
+                if CAPTURE_ENABLED:
+                    body = await response.read()
+                    try:
+                        # Sıkıştırma ve disk yazımı event loop'u bekletmesin diye thread'de
+                        await asyncio.to_thread(
+                            capture_writer.write, url, response.status, response.reason, response.raw_headers, body
+                        )
+                    except OSError as e:
+                        logger.error("Capture yazma hatası: %s - %s", url, e)
+                
                 if response.status == 403 and "bot" in (await response.text()).lower():
-                    logger.warning(f"Bot tuzaklı sayfa: {url}")
+                    logger.warning("Bot tuzaklı sayfa: %s", url)
                     return [], None, None, None, None
                     
+                if response.status == 429:
+                    raise FetchError('rate_limited', "HTTP 429",
+                                     parse_retry_after(response.headers.get('Retry-After')))
+                
+                if response.status >= 500:
+                    raise FetchError('server_error', f"HTTP {response.status}",
+                                     parse_retry_after(response.headers.get('Retry-After')))
+                
                 if response.status != 200:
-                    logger.info(f"HTTP {response.status} hatası: {url}")
+                    logger.info("HTTP %s hatası: %s", response.status, url)
                     return [], None, None, None, None
                     
                 html = await response.text()
-        except aiohttp.ClientConnectionError:
-            logger.warning(f"Bağlantı hatası: {url}")
-            return [], None, None, None, None
+        except aiohttp.ClientConnectionError as e:
+            raise FetchError('connection', str(e))
         except asyncio.TimeoutError:
-            logger.warning(f"Zaman aşımı: {url}")
-            return [], None, None, None, None
-        except aiohttp.ClientPayloadError:
-            logger.warning(f"Veri alma hatası: {url}")
-            return [], None, None, None, None
+            raise FetchError('timeout', f"{REQUEST_TIMEOUT}s")
+        except aiohttp.ClientPayloadError as e:
+            raise FetchError('payload', str(e))
         
         title, text, lang, script_count = extract_content(html)
         if not title:
             return [], None, None, None, None
             
         if len(text) < MIN_CONTENT_LENGTH and script_count > JS_RENDER_THRESHOLD:
-            logger.info(f"JavaScript render gerekli ({script_count} script): {url}")
+            logger.info("JavaScript render gerekli (%s script): %s", script_count, url)
             js_title, js_text, js_lang, js_timestamp = await fetch_with_js(url)
             if js_text and len(js_text) >= MIN_CONTENT_LENGTH:
                 title = js_title
@@ -161,52 +171,78 @@ async def crawl_page(session, url):
                 return [], None, None, None, None
         else:
             if len(text) < MIN_CONTENT_LENGTH:
-                logger.info(f"Yetersiz içerik: {url}")
+                logger.info("Yetersiz içerik: %s", url)
                 return [], None, None, None, None
                 
             timestamp = datetime.utcnow().isoformat()
             
         if is_spam(text):
-            logger.info(f"Spam içerik engellendi: {url}")
+            logger.info("Spam içerik engellendi: %s", url)
             return [], None, None, None, None
             
         links = extract_links(html, url)
-        logger.info(f"{len(links)} yeni link bulundu")
+        logger.info("%s yeni link bulundu", len(links))
         return links, title, text, lang, timestamp
         
+    except FetchError:
+        raise
     except Exception as e:
-        logger.error(f"Tarama hatası: {url} - {str(e)}", exc_info=True)
+        logger.error("Tarama hatası: %s - %s", url, e, exc_info=True)
         return [], None, None, None, None
 
 async def process_url(session, item):
     try:
         url = item['url']
         domain = item.get('domain', urlparse(url).netloc)
-        logger.info(f"İşleniyor: {url}")
+        logger.info("İşleniyor: %s", url)
         
         try:
             sitemap_links = await parse_sitemap(session, domain)
             if sitemap_links:
-                logger.info(f"{domain} için {len(sitemap_links)} sitemap linki bulundu")
+                logger.info("%s için %s sitemap linki bulundu", domain, len(sitemap_links))
                 mysql_handler.insert_links_bulk(sitemap_links)
         except Exception as e:
-            logger.error(f"Sitemap tarama hatası: {url} - {str(e)}", exc_info=True)
+            logger.error("Sitemap tarama hatası: %s - %s", url, e, exc_info=True)
         
         new_links, title, text, lang, timestamp = await crawl_page(session, url)
+        host_health.record_success(domain)
         if title and text:
-            logger.info(f"Başarıyla taranan: {url} - {title[:50]}...")
-            sqlite_handler.save_to_sqlite(url, title, text, lang, timestamp)
-            if new_links:
-                logger.info(f"{len(new_links)} yeni link bulundu, MySQL'e ekleniyor...")
-                mysql_handler.insert_links_bulk(new_links)
-            mysql_handler.mark_link_visited(item['id'])
+            logger.info("Başarıyla taranan: %s - %s...", url, title[:50])
+            changed, schedule = schedule_next_fetch(item, content_fingerprint(text))
+            # Saf Python bit döngüsü; event loop'u bekletmemesi için thread'de hesaplanır
+            simhash = await asyncio.to_thread(compute_simhash, text) if changed else None
+            duplicate_of = near_duplicates.find(simhash, exclude_url=url) if changed else None
+            if not changed:
+                logger.info("İçerik değişmemiş, kayıt atlandı: %s", url)
+            elif duplicate_of:
+                logger.info("Yakın kopya sayfa atlandı: %s ~ %s", url, duplicate_of)
+            else:
+                near_duplicates.add(url, simhash)
+                sqlite_handler.save_to_sqlite(url, title, text, lang, timestamp, to_signed(simhash))
+                if new_links:
+                    logger.info("%s yeni link bulundu, MySQL'e ekleniyor...", len(new_links))
+                    mysql_handler.insert_links_bulk(new_links)
+                    link_ids = mysql_handler.get_link_ids(new_links)
+                    edge_writer.add(item['id'], link_ids.values())
+            logger.debug("Sonraki tarama: %s - %s", url, schedule['next_fetch_at'])
+            mysql_handler.mark_link_visited(item['id'], schedule)
         else:
             mysql_handler.mark_link_error(item['id'])
             
-        logger.info(f"İşlem tamamlandı: {url}")
+        logger.info("İşlem tamamlandı: %s", url)
         
+    except FetchError as e:
+        host_health.record_failure(domain, e.kind, e.retry_after)
+        host_health.record_error(url, e.kind, str(e))
+        delay = retry_queue.push(item, e)
+        if delay is None:
+            logger.warning("Yeniden deneme hakkı bitti (%s): %s", e.kind, url)
+            mysql_handler.mark_link_error(item['id'])
+        else:
+            logger.warning("Geçici hata (%s), %.0fs sonra tekrar denenecek: %s", e, delay, url)
     except Exception as e:
-        logger.error(f"URL işleme hatası: {url} - {str(e)}", exc_info=True)
+        logger.error("URL işleme hatası: %s - %s", url, e, exc_info=True)
+        host_health.record_error(url, type(e).__name__, str(e))
         mysql_handler.mark_link_error(item['id'])
     finally:
         await asyncio.sleep(random.uniform(1, 4))
\ No newline at end of file
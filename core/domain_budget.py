@@ -0,0 +1,80 @@
+import time
+from datetime import datetime
+from utils.config import DOMAIN_LIMIT, WHITELISTED_DOMAINS, DOMAIN_COUNTER_FLUSH_INTERVAL
+
+class DomainBudget:
+    def __init__(self, limit=DOMAIN_LIMIT, whitelist=WHITELISTED_DOMAINS):
+        self.limit = limit
+        # Whitelist kontrolü her URL'de endswith döngüsü yerine tek set araması
+        self.whitelist_suffixes = {ext.lower().strip('.') for ext in whitelist}
+        self.day = datetime.utcnow().date()
+        self.counts = {}
+        self.whitelisted = {}
+        self.dirty = set()
+        self.carried = []
+        self.last_flush = time.monotonic()
+
+    def is_whitelisted(self, domain):
+        cached = self.whitelisted.get(domain)
+        if cached is not None:
+            return cached
+
+        labels = domain.lower().split('.')
+        result = any('.'.join(labels[i:]) in self.whitelist_suffixes for i in range(len(labels)))
+        self.whitelisted[domain] = result
+        return result
+
+    def _rollover(self):
+        today = datetime.utcnow().date()
+        if today != self.day:
+            # Önceki günün yazılmamış sayaçları bir sonraki flush'a taşınır
+            self.carried.extend(self._dirty_rows())
+            self.day = today
+            self.counts.clear()
+            self.dirty.clear()
+
+    def load(self, rows):
+        # rows: domain_counters tablosundan (domain, count, last_updated)
+        self._rollover()
+        for domain, count, last_updated in rows:
+            if last_updated == self.day:
+                self.counts[domain] = max(count, self.counts.get(domain, 0))
+
+    def try_acquire(self, domain):
+        self._rollover()
+        count = self.counts.get(domain, 0)
+        if count >= self.limit and not self.is_whitelisted(domain):
+            return False
+
+        self.counts[domain] = count + 1
+        self.dirty.add(domain)
+        return True
+
+    def should_flush(self):
+        if self.carried:
+            return True
+        return bool(self.dirty) and time.monotonic() - self.last_flush >= DOMAIN_COUNTER_FLUSH_INTERVAL
+
+    def _dirty_rows(self):
+        return [
+            (domain, self.counts[domain], self.day, self.is_whitelisted(domain))
+            for domain in self.dirty
+        ]
+
+    def drain(self):
+        self._rollover()
+        rows = self.carried + self._dirty_rows()
+        self.carried = []
+        self.dirty.clear()
+        self.last_flush = time.monotonic()
+        return rows
+
+    def requeue(self, rows):
+        # Yazılamayan satırlar: bugünküler tekrar kirli işaretlenir, eski günler olduğu gibi saklanır
+        for row in rows:
+            if row[2] == self.day and row[0] in self.counts:
+                self.dirty.add(row[0])
+            else:
+                self.carried.append(row)
+
+domain_budget = DomainBudget()
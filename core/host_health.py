@@ -0,0 +1,142 @@
+import time
+from collections import deque
+from datetime import datetime
+from utils.logger import logger
+from utils.config import (
+    CIRCUIT_WINDOW, CIRCUIT_WINDOW_SECONDS, CIRCUIT_MIN_REQUESTS, CIRCUIT_ERROR_RATE, CIRCUIT_TIMEOUT_THRESHOLD,
+    CIRCUIT_COOLDOWN, CIRCUIT_MAX_COOLDOWN, ERROR_LOG_FLUSH_INTERVAL, ERROR_LOG_BUFFER_MAX
+)
+
+class HostHealth:
+    def __init__(self):
+        # outcomes: yalnızca yakın zamanda hata almış hostlar için (zaman, hata mı) penceresi
+        self.outcomes = {}
+        self.consecutive_timeouts = {}
+        self.open_until = {}
+        # cooldowns: host -> (son soğuma süresi, bu sürenin unutulacağı an)
+        self.cooldowns = {}
+        self.half_open = {}
+        self.error_events = deque(maxlen=ERROR_LOG_BUFFER_MAX)
+        self.last_flush = time.monotonic()
+        self.last_prune = time.monotonic()
+
+    def blocked_for(self, host):
+        until = self.open_until.get(host)
+        if until is None:
+            return 0
+
+        remaining = until - time.monotonic()
+        if remaining > 0:
+            return remaining
+
+        # Soğuma bitti: host yarı açık, bir sonraki sonuç devreyi kapatır ya da tekrar açar
+        del self.open_until[host]
+        self.half_open[host] = time.monotonic()
+        self.outcomes.pop(host, None)
+        self.consecutive_timeouts.pop(host, None)
+        return 0
+
+    def open_hosts(self):
+        now = time.monotonic()
+        return [host for host, until in self.open_until.items() if until > now]
+
+    def _window(self, host, now):
+        # Pencere hem son CIRCUIT_WINDOW sonuçla hem de CIRCUIT_WINDOW_SECONDS ile sınırlı
+        window = self.outcomes.get(host)
+        if window is None:
+            return None
+        while window and now - window[0][0] > CIRCUIT_WINDOW_SECONDS:
+            window.popleft()
+        if not any(failed for _, failed in window):
+            del self.outcomes[host]
+            self.consecutive_timeouts.pop(host, None)
+            return None
+        return window
+
+    def record_success(self, host):
+        now = time.monotonic()
+        self._maybe_prune(now)
+        # Hatası olmayan hostlar için pencere tutulmaz
+        window = self._window(host, now)
+        if window is not None:
+            window.append((now, False))
+        self.consecutive_timeouts.pop(host, None)
+        if self.half_open.pop(host, None) is not None:
+            self.cooldowns.pop(host, None)
+            logger.info("Devre kapandı: %s", host)
+
+    def record_failure(self, host, kind, retry_after=None):
+        now = time.monotonic()
+        self._maybe_prune(now)
+        window = self._window(host, now)
+        if window is None:
+            window = self.outcomes[host] = deque(maxlen=CIRCUIT_WINDOW)
+        window.append((now, True))
+        if kind == 'timeout':
+            self.consecutive_timeouts[host] = self.consecutive_timeouts.get(host, 0) + 1
+        else:
+            self.consecutive_timeouts.pop(host, None)
+
+        error_rate = sum(failed for _, failed in window) / len(window)
+        reason = None
+        if host in self.half_open:
+            reason = "yarı açık denemede hata"
+        elif kind == 'rate_limited' and retry_after:
+            reason = f"HTTP 429, Retry-After {retry_after}s"
+        elif self.consecutive_timeouts.get(host, 0) >= CIRCUIT_TIMEOUT_THRESHOLD:
+            reason = f"{self.consecutive_timeouts[host]} ardışık zaman aşımı"
+        elif len(window) >= CIRCUIT_MIN_REQUESTS and error_rate >= CIRCUIT_ERROR_RATE:
+            reason = f"hata oranı %{error_rate * 100:.0f}"
+
+        if reason:
+            self._open(host, reason, retry_after)
+
+    def _open(self, host, reason, retry_after=None):
+        # Tekrar tekrar açılan hostlar için soğuma süresi katlanarak uzar
+        now = time.monotonic()
+        previous = self.cooldowns.get(host)
+        if previous is None or previous[1] <= now:
+            cooldown = CIRCUIT_COOLDOWN
+        else:
+            cooldown = min(CIRCUIT_MAX_COOLDOWN, previous[0] * 2)
+        if retry_after:
+            cooldown = max(cooldown, min(CIRCUIT_MAX_COOLDOWN, retry_after))
+        # Soğuma bittikten sonra CIRCUIT_MAX_COOLDOWN boyunca tekrar açılmazsa katlama unutulur
+        self.cooldowns[host] = (cooldown, now + cooldown + CIRCUIT_MAX_COOLDOWN)
+
+        self.open_until[host] = now + cooldown
+        self.half_open.pop(host, None)
+        self.outcomes.pop(host, None)
+        self.consecutive_timeouts.pop(host, None)
+        logger.warning("Devre açıldı: %s (%s), %.0fs ertelenecek", host, reason, cooldown)
+
+    def _maybe_prune(self, now):
+        if now - self.last_prune < CIRCUIT_WINDOW_SECONDS:
+            return
+        self.last_prune = now
+
+        # Uzun süredir görülmeyen hostların durumu atılır; aksi halde her host için kayıt birikir
+        for host in list(self.outcomes):
+            self._window(host, now)
+        for host in [host for host in self.consecutive_timeouts if host not in self.outcomes]:
+            del self.consecutive_timeouts[host]
+        for host in [host for host, until in self.open_until.items() if now - until > CIRCUIT_MAX_COOLDOWN]:
+            del self.open_until[host]
+        for host in [host for host, since in self.half_open.items() if now - since > CIRCUIT_MAX_COOLDOWN]:
+            del self.half_open[host]
+        for host in [host for host, (_, forget_at) in self.cooldowns.items() if forget_at <= now]:
+            del self.cooldowns[host]
+
+    def record_error(self, url, error_type, message):
+        self.error_events.append((url[:2048], error_type[:255], message, datetime.utcnow()))
+
+    def should_flush(self):
+        return bool(self.error_events) and time.monotonic() - self.last_flush >= ERROR_LOG_FLUSH_INTERVAL
+
+    def drain_errors(self):
+        events = list(self.error_events)
+        self.error_events.clear()
+        self.last_flush = time.monotonic()
+        return events
+
+host_health = HostHealth()
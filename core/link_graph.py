@@ -0,0 +1,126 @@
+import os
+import glob
+import time
+from array import array
+from utils.logger import logger
+from utils.config import (
+    LINK_GRAPH_DIR, LINK_GRAPH_SEGMENT_MAX_BYTES, LINK_GRAPH_BUFFER_EDGES,
+    LINK_GRAPH_FLUSH_INTERVAL, PAGERANK_DAMPING, PAGERANK_MAX_ITERATIONS, PAGERANK_TOLERANCE
+)
+from database import mysql_handler
+
+class EdgeWriter:
+    # Kenarlar bots.id çiftleri olarak (uint32 kaynak, uint32 hedef) append-only dosyalara yazılır
+    def __init__(self, directory=LINK_GRAPH_DIR, max_bytes=LINK_GRAPH_SEGMENT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.buffer = array('I')
+        self.path = None
+        self.last_flush = time.monotonic()
+
+    def add(self, source_id, target_ids):
+        for target_id in target_ids:
+            if target_id != source_id:
+                self.buffer.append(source_id)
+                self.buffer.append(target_id)
+
+        if (len(self.buffer) // 2 >= LINK_GRAPH_BUFFER_EDGES
+                or time.monotonic() - self.last_flush >= LINK_GRAPH_FLUSH_INTERVAL):
+            self.flush()
+
+    def _segment_path(self):
+        if self.path is None or not os.path.exists(self.path) or os.path.getsize(self.path) >= self.max_bytes:
+            os.makedirs(self.directory, exist_ok=True)
+            existing = sorted(glob.glob(os.path.join(self.directory, 'edges-*.bin')))
+            number = int(os.path.basename(existing[-1])[6:-4]) if existing else 0
+            if existing and os.path.getsize(existing[-1]) < self.max_bytes:
+                self.path = existing[-1]
+            else:
+                self.path = os.path.join(self.directory, f"edges-{number + 1:06d}.bin")
+        return self.path
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+
+        try:
+            if self.buffer.itemsize != 4:
+                raise ValueError("uint32 kenar dizisi bu platformda desteklenmiyor")
+            with open(self._segment_path(), 'ab') as segment:
+                self.buffer.tofile(segment)
+            self.buffer = array('I')
+        except Exception as e:
+            logger.error("Link grafı yazma hatası: %s", e, exc_info=True)
+
+def load_edges(directory=LINK_GRAPH_DIR):
+    import numpy as np
+
+    parts = []
+    for path in sorted(glob.glob(os.path.join(directory, 'edges-*.bin'))):
+        # Yazımı süren segmentin yarım kalan son kaydı atlanır
+        count = os.path.getsize(path) // 8
+        if count:
+            parts.append(np.fromfile(path, dtype='<u4', count=count * 2).reshape(-1, 2))
+
+    if not parts:
+        return np.empty((0, 2), dtype=np.uint32)
+    return np.concatenate(parts)
+
+def compute_pagerank(edges, damping=PAGERANK_DAMPING, max_iterations=PAGERANK_MAX_ITERATIONS, tolerance=PAGERANK_TOLERANCE):
+    import numpy as np
+    from scipy import sparse
+
+    # Tekrar taramalarda yazılan aynı kenarlar tek sayılır
+    keys = np.unique((edges[:, 0].astype(np.uint64) << np.uint64(32)) | edges[:, 1].astype(np.uint64))
+    sources = (keys >> np.uint64(32)).astype(np.uint32)
+    targets = (keys & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    nodes, inverse = np.unique(np.concatenate([sources, targets]), return_inverse=True)
+    n = len(nodes)
+    src = inverse[:len(sources)]
+    dst = inverse[len(sources):]
+
+    out_degree = np.bincount(src, minlength=n)
+    in_degree = np.bincount(dst, minlength=n)
+    dangling = out_degree == 0
+
+    weights = 1.0 / out_degree[src]
+    matrix = sparse.csr_matrix((weights, (dst, src)), shape=(n, n))
+
+    rank = np.full(n, 1.0 / n)
+    for iteration in range(max_iterations):
+        new_rank = damping * (matrix @ rank + rank[dangling].sum() / n) + (1.0 - damping) / n
+        delta = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if delta < tolerance:
+            break
+
+    return nodes, rank, in_degree, iteration + 1
+
+def update_priorities():
+    try:
+        started = time.monotonic()
+        edges = load_edges()
+        if not len(edges):
+            logger.info("PageRank: link grafı henüz boş")
+            return 0
+
+        nodes, rank, in_degree, iterations = compute_pagerank(edges)
+        # Ortalama skor 1 olacak şekilde ölçeklenir
+        scores = rank * len(nodes)
+        mysql_handler.update_priorities(zip(nodes.tolist(), scores.tolist()))
+
+        logger.info(
+            "PageRank güncellendi: %s düğüm, %s kenar, %s iterasyon, maks. in-degree %s, süre %.1fs",
+            len(nodes), len(edges), iterations, int(in_degree.max()), time.monotonic() - started
+        )
+        return len(nodes)
+    except ImportError as e:
+        logger.warning("PageRank için numpy/scipy gerekli: %s", e)
+        return 0
+    except Exception as e:
+        logger.error("PageRank hatası: %s", e, exc_info=True)
+        return 0
+
+edge_writer = EdgeWriter()
@@ -0,0 +1,155 @@
+import re
+import sqlite3
+import threading
+import hashlib
+from collections import Counter
+from utils.logger import logger
+from utils.config import (
+    SQLITE_DB_PATH, SIMHASH_BANDS, SIMHASH_MAX_DISTANCE, SIMHASH_SHINGLE_SIZE, SIMHASH_MAX_CHARS,
+    SIMHASH_BACKFILL_BATCH_SIZE
+)
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+MASK_64 = (1 << 64) - 1
+
+def compute_simhash(text, shingle_size=SIMHASH_SHINGLE_SIZE):
+    # SQLite'a yazılan içerikle aynı önek: canlı tarama ve backfill aynı parmak izini üretir
+    tokens = TOKEN_PATTERN.findall(text[:SIMHASH_MAX_CHARS].lower())
+    if len(tokens) > shingle_size:
+        features = Counter(' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1))
+    else:
+        features = Counter(tokens)
+
+    vector = [0] * 64
+    for feature, weight in features.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+        for bit in range(64):
+            if value >> bit & 1:
+                vector[bit] += weight
+            else:
+                vector[bit] -= weight
+
+    simhash = 0
+    for bit in range(64):
+        if vector[bit] > 0:
+            simhash |= 1 << bit
+    return simhash
+
+def to_signed(value):
+    # SQLite INTEGER işaretli 64 bit tutar
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def to_unsigned(value):
+    return value & MASK_64
+
+class NearDuplicateIndex:
+    # 64 bit parmak izi SIMHASH_BANDS parçaya bölünür; mesafe <= SIMHASH_MAX_DISTANCE olan
+    # iki parmak izi (güvercin yuvası ilkesiyle) en az bir parçada birebir eşleşir
+    def __init__(self, bands=SIMHASH_BANDS, max_distance=SIMHASH_MAX_DISTANCE):
+        if max_distance >= bands:
+            raise ValueError("SIMHASH_BANDS, SIMHASH_MAX_DISTANCE değerinden büyük olmalı")
+        self.bands = bands
+        self.max_distance = max_distance
+        self.band_bits = 64 // bands
+        self.band_mask = (1 << self.band_bits) - 1
+        self.tables = [{} for _ in range(bands)]
+        self.by_url = {}
+        self.loaded = False
+        self.backfill_done = False
+        # Backfill işi thread'de ekleme yapar, event loop aynı anda find çağırabilir
+        self.lock = threading.Lock()
+
+    def _band_keys(self, simhash):
+        return [(simhash >> (i * self.band_bits)) & self.band_mask for i in range(self.bands)]
+
+    def find(self, simhash, exclude_url=None):
+        with self.lock:
+            return self._find(simhash, exclude_url)
+
+    def _find(self, simhash, exclude_url):
+        for table, key in zip(self.tables, self._band_keys(simhash)):
+            for url in table.get(key, ()):
+                if url == exclude_url:
+                    continue
+                if bin(simhash ^ self.by_url[url]).count('1') <= self.max_distance:
+                    return url
+        return None
+
+    def add(self, url, simhash):
+        with self.lock:
+            self._remove(url)
+            self.by_url[url] = simhash
+            for table, key in zip(self.tables, self._band_keys(simhash)):
+                table.setdefault(key, []).append(url)
+
+    def remove(self, url):
+        with self.lock:
+            self._remove(url)
+
+    def _remove(self, url):
+        simhash = self.by_url.pop(url, None)
+        if simhash is None:
+            return
+        for table, key in zip(self.tables, self._band_keys(simhash)):
+            bucket = table.get(key)
+            if bucket:
+                bucket.remove(url)
+                if not bucket:
+                    del table[key]
+
+    def load(self):
+        conn = None
+        try:
+            conn = sqlite3.connect(SQLITE_DB_PATH, timeout=30)
+            cursor = conn.execute("SELECT url, simhash FROM pages WHERE simhash IS NOT NULL")
+            for url, simhash in cursor:
+                self.add(url, to_unsigned(simhash))
+            self.loaded = True
+            logger.info("SimHash indeksi yüklendi: %s sayfa", len(self.by_url))
+        except Exception as e:
+            logger.error("SimHash indeksi yükleme hatası: %s", e, exc_info=True)
+        finally:
+            if conn:
+                conn.close()
+
+    def backfill(self, batch_size=SIMHASH_BACKFILL_BATCH_SIZE):
+        # simhash sütunundan önce kaydedilmiş sayfalar, her çağrıda tek parti; içerik
+        # değişmediği için change_seq artmaz. Kısmi indeks sayesinde iş bitince sorgu boş döner
+        if self.backfill_done:
+            return 0
+
+        conn = None
+        try:
+            conn = sqlite3.connect(SQLITE_DB_PATH, timeout=30)
+            conn.execute("PRAGMA busy_timeout = 30000")
+            rows = conn.execute("""
+                SELECT id, url, content
+                FROM pages
+                WHERE simhash IS NULL AND content IS NOT NULL AND content != ''
+                ORDER BY id
+                LIMIT ?
+            """, (batch_size,)).fetchall()
+            if not rows:
+                self.backfill_done = True
+                return 0
+
+            hashes = [(page_id, url, compute_simhash(content)) for page_id, url, content in rows]
+            with conn:
+                conn.executemany(
+                    "UPDATE pages SET simhash = ? WHERE id = ? AND simhash IS NULL",
+                    [(to_signed(simhash), page_id) for page_id, _, simhash in hashes]
+                )
+            for _, url, simhash in hashes:
+                # Bu arada crawler sayfayı yeni parmak iziyle eklediyse o korunur
+                if url not in self.by_url:
+                    self.add(url, simhash)
+            logger.info("SimHash backfill: %s sayfa eklendi", len(hashes))
+            return len(hashes)
+        except Exception as e:
+            logger.error("SimHash backfill hatası: %s", e, exc_info=True)
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+near_duplicates = NearDuplicateIndex()
@@ -1,9 +1,8 @@
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-from utils.helpers import normalize_url, is_valid_link
+from utils.helpers import normalize_url, is_valid_link, detect_language
 from utils.config import MIN_CONTENT_LENGTH, JS_RENDER_THRESHOLD
 from utils.logger import logger
-from langdetect import detect
 import re
 
 def extract_links(html, base_url):
@@ -35,11 +34,6 @@ def extract_content(html):
         
     text = soup.get_text(separator=' ', strip=True)
     
-    lang = 'unknown'
-    if text and len(text) > 100:
-        try:
-            lang = detect(text[:500])
-        except:
-            pass
+    lang = detect_language(text)
             
     return title, text, lang, script_count
\ No newline at end of file
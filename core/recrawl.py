@@ -0,0 +1,61 @@
+import hashlib
+import math
+from datetime import datetime, timedelta
+from utils.config import (
+    RECRAWL_MIN_INTERVAL, RECRAWL_MAX_INTERVAL, RECRAWL_DEFAULT_INTERVAL,
+    PRIORITY_DOMAINS, PRIORITY_INTERVAL
+)
+
+def content_fingerprint(text):
+    # Boşluk farkları değişiklik sayılmasın diye metin normalize edilir
+    normalized = ' '.join(text.split()).lower()
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+def estimate_change_rate(check_count, change_count, observed_seconds):
+    # Cho & Garcia-Molina tahmincisi: r = -ln((n - X + 0.5) / (n + 0.5)) / I
+    if check_count <= 0 or observed_seconds <= 0:
+        return None
+    
+    avg_interval = observed_seconds / check_count
+    ratio = (check_count - change_count + 0.5) / (check_count + 0.5)
+    return -math.log(ratio) / avg_interval
+
+def schedule_next_fetch(item, fingerprint, now=None):
+    now = now or datetime.utcnow()
+    
+    previous = item.get('content_hash')
+    check_count = item.get('check_count') or 0
+    change_count = item.get('change_count') or 0
+    observed_seconds = item.get('observed_seconds') or 0
+    
+    if previous is None:
+        changed = True
+        interval = RECRAWL_DEFAULT_INTERVAL
+    else:
+        changed = previous != fingerprint
+        last_crawled = item.get('last_crawled')
+        elapsed = (now - last_crawled).total_seconds() if last_crawled else 0
+        
+        check_count += 1
+        change_count += int(changed)
+        observed_seconds += max(0, int(elapsed))
+        
+        rate = estimate_change_rate(check_count, change_count, observed_seconds)
+        if change_count == 0 or not rate:
+            # Hiç değişiklik görülmediyse aralık kademeli olarak uzatılır
+            interval = max(RECRAWL_DEFAULT_INTERVAL, 2 * elapsed)
+        else:
+            interval = 1 / rate
+    
+    max_interval = RECRAWL_MAX_INTERVAL
+    if item.get('domain') in PRIORITY_DOMAINS:
+        max_interval = min(max_interval, PRIORITY_INTERVAL)
+    interval = min(max_interval, max(RECRAWL_MIN_INTERVAL, interval))
+    
+    return changed, {
+        'content_hash': fingerprint,
+        'check_count': check_count,
+        'change_count': change_count,
+        'observed_seconds': observed_seconds,
+        'next_fetch_at': now + timedelta(seconds=interval)
+    }
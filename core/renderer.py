@@ -1,11 +1,10 @@
 import asyncio
 import sys
 import random
-from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
-from langdetect import detect
 from datetime import datetime
 from utils.logger import logger
+from utils.helpers import detect_language
 from utils.config import USER_AGENTS, REQUEST_TIMEOUT
 
 # Windows'ta Playwright subprocess hatası için event loop politikası
@@ -15,7 +14,9 @@ if sys.platform.startswith("win"):
 async def fetch_with_js(url):
     browser = None
     try:
-        logger.info(f"[JS Render] Sayfa yükleniyor (Playwright): {url}")
+        logger.info("[JS Render] Sayfa yükleniyor (Playwright): %s", url)
+        # Playwright yalnızca JS gerektiren ilk sayfada yüklenir
+        from playwright.async_api import async_playwright
 
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
@@ -49,18 +50,12 @@ async def fetch_with_js(url):
                 tag.decompose()
 
             text = soup.get_text(separator=' ', strip=True)
-            lang = 'unknown'
-
-            if text and len(text) > 100:
-                try:
-                    lang = detect(text[:500])
-                except:
-                    pass
+            lang = detect_language(text)
 
             return title, text, lang, datetime.utcnow().isoformat()
 
     except Exception as e:
-        logger.error(f"[JS Render] Playwright hatası: {url} - {str(e)}", exc_info=True)
+        logger.error("[JS Render] Playwright hatası: %s - %s", url, e, exc_info=True)
         return None, None, None, None
 
     finally:
@@ -0,0 +1,198 @@
+import time
+import socket
+import asyncio
+import ipaddress
+import aiohttp
+from urllib.parse import urlparse
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import ThreadedResolver
+from utils.logger import logger
+from utils.config import (
+    HTTP_CONNECTION_LIMIT, HTTP_LIMIT_PER_HOST, HTTP_KEEPALIVE_TIMEOUT,
+    DNS_CACHE_DEFAULT_TTL, DNS_CACHE_MIN_TTL, DNS_CACHE_MAX_TTL, DNS_NEGATIVE_TTL,
+    DNS_CACHE_MAX_ENTRIES, DNS_PREFETCH_CONCURRENCY
+)
+
+# Kesin "böyle bir isim yok" cevapları; zaman aşımı gibi geçici hatalar önbelleğe alınmaz
+PERMANENT_GAI_ERRORS = {getattr(socket, name) for name in ('EAI_NONAME', 'EAI_NODATA') if hasattr(socket, name)}
+PERMANENT_ARES_ERRORS = {1, 4}  # ARES_ENODATA, ARES_ENOTFOUND
+NUMERIC_FLAGS = socket.AI_NUMERICHOST | socket.AI_NUMERICSERV
+
+def host_of(domain):
+    # bots.domain bir netloc'tur: kullanıcı bilgisi ve port ayıklanır
+    try:
+        host = urlparse(f"//{domain}").hostname
+    except ValueError:
+        return None
+    if not host:
+        return None
+    try:
+        ipaddress.ip_address(host)
+        return None
+    except ValueError:
+        return host
+
+class CachingResolver(AbstractResolver):
+    # Tüm oturum tek önbelleği paylaşır; aynı host için eşzamanlı sorgular tek çözümlemeye iner
+    def __init__(self):
+        self.backend = None
+        self.aiodns = None
+        self.cache = {}
+        self.pending = {}
+        self.prefetch_slots = None
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.prefetched = 0
+
+    def _backend(self):
+        # Çözümleyici event loop'a bağlıdır, ilk kullanımda oluşturulur
+        if self.backend is None:
+            try:
+                import aiodns
+                self.aiodns = aiodns
+                self.backend = aiodns.DNSResolver()
+            except ImportError:
+                self.backend = ThreadedResolver()
+        return self.backend
+
+    async def _query(self, host):
+        backend = self._backend()
+        if self.aiodns is None:
+            # getaddrinfo TTL döndürmez, varsayılan süre kullanılır
+            results = await backend.resolve(host, 0, socket.AF_UNSPEC)
+            return [(result['host'], result['family']) for result in results], DNS_CACHE_DEFAULT_TTL
+
+        response = await backend.getaddrinfo(
+            host, family=socket.AF_UNSPEC, type=socket.SOCK_STREAM,
+            flags=getattr(socket, 'AI_ADDRCONFIG', 0)
+        )
+        addresses = [(node.addr[0].decode('ascii'), node.family) for node in response.nodes]
+        ttl = min((node.ttl for node in response.nodes), default=DNS_CACHE_DEFAULT_TTL)
+        return addresses, ttl
+
+    def _is_permanent(self, error):
+        if isinstance(error, socket.gaierror):
+            return error.errno in PERMANENT_GAI_ERRORS
+        if self.aiodns and isinstance(error, self.aiodns.error.DNSError):
+            return bool(error.args) and error.args[0] in PERMANENT_ARES_ERRORS
+        return False
+
+    def _store(self, host, entry):
+        if len(self.cache) >= DNS_CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            self.cache = {key: value for key, value in self.cache.items() if value[0] > now}
+            if len(self.cache) >= DNS_CACHE_MAX_ENTRIES:
+                # Süresi dolmamış kayıtlar da taşıyorsa en eski çeyrek atılır
+                for key in list(self.cache)[:DNS_CACHE_MAX_ENTRIES // 4]:
+                    del self.cache[key]
+        self.cache.pop(host, None)
+        self.cache[host] = entry
+
+    async def _lookup(self, host):
+        try:
+            addresses, ttl = await self._query(host)
+            if not addresses:
+                raise socket.gaierror(socket.EAI_NONAME, "DNS lookup failed")
+            ttl = max(DNS_CACHE_MIN_TTL, min(DNS_CACHE_MAX_TTL, ttl))
+            entry = (time.monotonic() + ttl, addresses, None)
+            self._store(host, entry)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            message = e.args[1] if len(e.args) > 1 else str(e) or "DNS lookup failed"
+            if self._is_permanent(e):
+                entry = (time.monotonic() + DNS_NEGATIVE_TTL, None, message)
+                self._store(host, entry)
+            else:
+                entry = (0, None, message)
+            logger.debug("DNS çözümleme hatası: %s - %s", host, message)
+        finally:
+            self.pending.pop(host, None)
+        return entry
+
+    def _cached(self, host):
+        entry = self.cache.get(host)
+        if entry and entry[0] > time.monotonic():
+            return entry
+        return None
+
+    async def _entry(self, host):
+        entry = self._cached(host)
+        if entry:
+            self.hits += 1
+            return entry
+
+        task = self.pending.get(host)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._lookup(host))
+            self.pending[host] = task
+        # shield: bir isteğin iptali aynı sorguyu bekleyen diğerlerini etkilemez
+        return await asyncio.shield(task)
+
+    async def resolve(self, host, port=0, family=socket.AF_UNSPEC):
+        _, addresses, error = await self._entry(host.lower())
+        if error:
+            self.negative_hits += 1
+            raise OSError(None, error)
+
+        results = [
+            {'hostname': host, 'host': address, 'port': port,
+             'family': address_family, 'proto': 0, 'flags': NUMERIC_FLAGS}
+            for address, address_family in addresses
+            if family == socket.AF_UNSPEC or address_family == family
+        ]
+        if not results:
+            raise OSError(None, "DNS lookup failed")
+        return results
+
+    async def _prefetch_one(self, host):
+        async with self.prefetch_slots:
+            if self._cached(host) or host in self.pending:
+                return
+            task = asyncio.ensure_future(self._lookup(host))
+            self.pending[host] = task
+            await asyncio.shield(task)
+            self.prefetched += 1
+
+    async def prefetch(self, domains):
+        if self.prefetch_slots is None:
+            self.prefetch_slots = asyncio.Semaphore(DNS_PREFETCH_CONCURRENCY)
+
+        hosts = {host for host in map(host_of, domains) if host}
+        hosts = [host for host in hosts if not self._cached(host) and host not in self.pending]
+        if hosts:
+            await asyncio.gather(*(self._prefetch_one(host) for host in hosts))
+        return len(hosts)
+
+    def stats(self):
+        return {
+            'entries': len(self.cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'negative_hits': self.negative_hits,
+            'prefetched': self.prefetched
+        }
+
+    async def close(self):
+        for task in list(self.pending.values()):
+            task.cancel()
+        if self.backend is not None:
+            if self.aiodns is None:
+                await self.backend.close()
+            else:
+                self.backend.cancel()
+            self.backend = None
+
+def create_connector(resolver):
+    # aiohttp'nin kendi 10 saniyelik DNS önbelleği kapatılır, TTL'li paylaşılan önbellek kullanılır
+    return aiohttp.TCPConnector(
+        limit=HTTP_CONNECTION_LIMIT,
+        limit_per_host=HTTP_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        use_dns_cache=False,
+        resolver=resolver
+    )
+
+dns_cache = CachingResolver()
@@ -0,0 +1,78 @@
+import time
+import heapq
+import random
+import itertools
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from utils.config import RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY, RETRY_AFTER_MAX
+
+class FetchError(Exception):
+    # kind: timeout, connection, payload, server_error, rate_limited
+    def __init__(self, kind, message='', retry_after=None):
+        super().__init__(f"{kind}: {message}" if message else kind)
+        self.kind = kind
+        self.retry_after = retry_after
+
+def parse_retry_after(value):
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0, int((retry_at - datetime.now(timezone.utc)).total_seconds()))
+
+class RetryQueue:
+    # Bekleme worker'ı uyutmaz: URL zamanı gelene kadar heap'te durur
+    def __init__(self):
+        self.heap = []
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def backoff(self, attempt, error):
+        if error.retry_after is not None:
+            return min(RETRY_AFTER_MAX, error.retry_after)
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def push(self, item, error):
+        attempt = item.get('retry_attempt', 0) + 1
+        if attempt > RETRY_MAX_ATTEMPTS:
+            return None
+
+        delay = self.backoff(attempt, error)
+        item = dict(item, retry_attempt=attempt, retry_reason=error.kind)
+        heapq.heappush(self.heap, (time.monotonic() + delay, next(self.counter), item))
+        return delay
+
+    def defer(self, item, delay):
+        # Deneme hakkı harcamadan ertelenen URL'ler (ör. devresi açık hostlar)
+        heapq.heappush(self.heap, (time.monotonic() + delay, next(self.counter), item))
+
+    def pop_due(self, limit):
+        now = time.monotonic()
+        due = []
+        while self.heap and len(due) < limit and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap)[2])
+        return due
+
+    def next_due_in(self):
+        if not self.heap:
+            return None
+        return max(0.0, self.heap[0][0] - time.monotonic())
+
+    def drain(self):
+        items = [entry[2] for entry in self.heap]
+        self.heap = []
+        return items
+
+retry_queue = RetryQueue()
@@ -1,11 +1,22 @@
 import aiohttp
 import asyncio
+import inspect
 import psutil
 import random
+import time
 from utils.logger import logger
-from utils.config import MAX_CONCURRENT_REQUESTS
-from database import mysql_handler
+from utils.config import (
+    MAX_CONCURRENT_REQUESTS, INDEX_INTERVAL, PAGERANK_INTERVAL, DNS_PREFETCH_INTERVAL, DNS_PREFETCH_LIMIT,
+    SIMHASH_BACKFILL_INTERVAL
+)
+from database import mysql_handler, search_index
 from .crawler import process_url
+from .domain_budget import domain_budget
+from .link_graph import edge_writer, update_priorities
+from .near_duplicates import near_duplicates
+from .retry_queue import retry_queue
+from .host_health import host_health
+from .resolver import dns_cache, create_connector
 
 class DynamicConfig:
     def __init__(self):
@@ -29,8 +40,7 @@ class DynamicConfig:
             self.timeout_factor = max(0.7, self.timeout_factor - 0.1)
         
         if old_concurrency != self.concurrency_level or old_timeout != self.timeout_factor:
-            logger.info(f"Konfig güncellendi: Concurrency={self.concurrency_level} TimeoutF={self.timeout_factor:.1f} "
-                        f"(CPU={cpu_percent}% RAM={ram_percent}%)")
+            logger.info("Konfig güncellendi: Concurrency=%s TimeoutF=%.1f (CPU=%s%% RAM=%s%%)", self.concurrency_level, self.timeout_factor, cpu_percent, ram_percent)
         
         self.update_count += 1
         if self.update_count > 10:
@@ -40,33 +50,137 @@ class DynamicConfig:
 
 dynamic_config = DynamicConfig()
 
+background_jobs = {}
+job_last_run = {}
+
+def schedule_job(name, interval, func, *args):
+    # Periyodik işler ayrı thread'de (async işler ayrı task'ta) çalışır, tarama döngüsünü bekletmez
+    task = background_jobs.get(name)
+    if task and not task.done():
+        return
+    
+    now = time.monotonic()
+    if now - job_last_run.get(name, 0) < interval:
+        return
+    
+    job_last_run[name] = now
+    if inspect.iscoroutinefunction(func):
+        background_jobs[name] = asyncio.create_task(func(*args))
+    else:
+        background_jobs[name] = asyncio.create_task(asyncio.to_thread(func, *args))
+
+def claim_batch(limit):
+    candidates = mysql_handler.get_unvisited_links(
+        limit=limit,
+        exclude_domains=host_health.open_hosts()
+    )
+    
+    batch = []
+    rejected = []
+    for item in candidates:
+        if domain_budget.try_acquire(item['domain']):
+            batch.append(item)
+        else:
+            rejected.append(item['id'])
+    
+    if rejected:
+        logger.info("Domain limiti dolduğu için %s link geri bırakıldı", len(rejected))
+        mysql_handler.release_links(rejected)
+    
+    return batch
+
+def flush_domain_budget(force=False):
+    if not force and not domain_budget.should_flush():
+        return
+    
+    rows = domain_budget.drain()
+    if not mysql_handler.flush_domain_counters(rows):
+        # Yazılamayan sayaçlar bir sonraki flush'ta tekrar denenir
+        domain_budget.requeue(rows)
+
+def defer_blocked_hosts(batch):
+    ready = []
+    for item in batch:
+        blocked_for = host_health.blocked_for(item['domain'])
+        if blocked_for:
+            retry_queue.defer(item, blocked_for)
+        else:
+            ready.append(item)
+    
+    if len(ready) < len(batch):
+        logger.info("Devresi açık hostlar için %s link ertelendi", len(batch) - len(ready))
+    return ready
+
+def flush_error_logs(force=False):
+    if not force and not host_health.should_flush():
+        return
+    
+    events = host_health.drain_errors()
+    if not mysql_handler.insert_error_logs(events):
+        host_health.error_events.extend(events)
+
+async def prefetch_frontier_hosts():
+    domains = await asyncio.to_thread(
+        mysql_handler.peek_frontier_domains, DNS_PREFETCH_LIMIT, host_health.open_hosts()
+    )
+    resolved = await dns_cache.prefetch(domains)
+    logger.debug("DNS ön çözümleme: %s yeni host, önbellek %s", resolved, dns_cache.stats())
+
+async def load_state():
+    domain_budget.load(mysql_handler.load_domain_counters())
+    await asyncio.to_thread(near_duplicates.load)
+
 async def main_worker():
     async with aiohttp.ClientSession(
-        connector=aiohttp.TCPConnector(limit_per_host=5),
+        connector=create_connector(dns_cache),
         trust_env=True
     ) as session:
-        while True:
-            try:
-                dynamic_config.update_based_on_resources()
-                
-                batch = mysql_handler.get_unvisited_links(limit=dynamic_config.concurrency_level)
-                
-                if not batch:
-                    logger.info("İşlenecek link yok, 10 saniye bekleniyor...")
-                    await asyncio.sleep(10)
-                    continue
-                
-                logger.info(f"{len(batch)} adet link işleme alındı")
-                
-                tasks = []
-                for item in batch:
-                    tasks.append(process_url(session, item))
-                
-                await asyncio.gather(*tasks)
-                
-                logger.info(f"Batch işlemi tamamlandı, 3 saniye bekleniyor...")
-                await asyncio.sleep(3)
-                
-            except Exception as e:
-                logger.error(f"Ana döngü hatası: {str(e)}", exc_info=True)
-                await asyncio.sleep(10)
\ No newline at end of file
+        try:
+            await worker_loop(session)
+        finally:
+            await dns_cache.close()
+            flush_domain_budget(force=True)
+            flush_error_logs(force=True)
+            edge_writer.flush()
+            # Kuyrukta bekleyen URL'ler sonraki çalıştırmada tekrar alınabilsin
+            mysql_handler.release_links([item['id'] for item in retry_queue.drain()])
+
+async def worker_loop(session):
+    while True:
+        try:
+            dynamic_config.update_based_on_resources()
+            flush_domain_budget()
+            flush_error_logs()
+            schedule_job('search_index', INDEX_INTERVAL, search_index.index_pending)
+            schedule_job('pagerank', PAGERANK_INTERVAL, update_priorities)
+            schedule_job('dns_prefetch', DNS_PREFETCH_INTERVAL, prefetch_frontier_hosts)
+            schedule_job('simhash_backfill', SIMHASH_BACKFILL_INTERVAL, near_duplicates.backfill)
+            
+            batch = retry_queue.pop_due(dynamic_config.concurrency_level)
+            if len(batch) < dynamic_config.concurrency_level:
+                batch += claim_batch(dynamic_config.concurrency_level - len(batch))
+            batch = defer_blocked_hosts(batch)
+            
+            if not batch:
+                wait = 10
+                next_retry = retry_queue.next_due_in()
+                if next_retry is not None:
+                    wait = min(wait, max(1, next_retry))
+                logger.info("İşlenecek link yok, %.0f saniye bekleniyor...", wait)
+                await asyncio.sleep(wait)
+                continue
+            
+            logger.info("%s adet link işleme alındı", len(batch))
+            
+            tasks = []
+            for item in batch:
+                tasks.append(process_url(session, item))
+            
+            await asyncio.gather(*tasks)
+            
+            logger.info("Batch işlemi tamamlandı, 3 saniye bekleniyor...")
+            await asyncio.sleep(3)
+            
+        except Exception as e:
+            logger.error("Ana döngü hatası: %s", e, exc_info=True)
+            await asyncio.sleep(10)
\ No newline at end of file
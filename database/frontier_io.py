@@ -0,0 +1,188 @@
+import io
+import sys
+import gzip
+from datetime import datetime
+from urllib.parse import urlparse
+from utils.logger import logger
+from utils.helpers import is_valid_link, normalize_url
+from utils.config import FRONTIER_IO_BATCH_SIZE
+from database import mysql_handler
+
+CHECKPOINT_HEADER = '#aybot-frontier v1'
+CHECKPOINT_COLUMNS = [
+    'url', 'domain', 'visited', 'error_count', 'last_crawled', 'next_fetch_at', 'priority',
+    'content_hash', 'check_count', 'change_count', 'observed_seconds'
+]
+DATETIME_COLUMNS = {'last_crawled', 'next_fetch_at'}
+INT_COLUMNS = {'visited', 'error_count', 'check_count', 'change_count', 'observed_seconds'}
+
+def open_text(path, mode='rt'):
+    if path == '-' and 'r' in mode:
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+
+    if 'r' in mode:
+        # Uzantıdan bağımsız olarak gzip imzasına bakılır
+        with open(path, 'rb') as probe:
+            gzipped = probe.read(2) == b'\x1f\x8b'
+    else:
+        gzipped = path.endswith('.gz')
+
+    if gzipped:
+        return gzip.open(path, mode, compresslevel=6, encoding='utf-8', errors='replace')
+    return open(path, mode, encoding='utf-8', errors='replace')
+
+def iter_seed_urls(lines):
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        # "url<TAB>..." biçimindeki dosyalarda yalnızca ilk sütun alınır
+        url = normalize_url(line.split(None, 1)[0])
+        if len(url) <= 2048 and is_valid_link(url):
+            yield url
+
+def _write_batch(cursor, query, rows):
+    cursor.executemany(query, rows)
+    return max(cursor.rowcount, 0)
+
+def import_seeds(path, batch_size=FRONTIER_IO_BATCH_SIZE):
+    conn = None
+    read = inserted = 0
+    try:
+        conn = mysql_handler.get_connection()
+        cursor = conn.cursor()
+        # executemany INSERT'i tek çok satırlı sorguya çevirir; dedupe UNIQUE(url) ile yapılır
+        query = "INSERT IGNORE INTO bots (url, domain) VALUES (%s, %s)"
+
+        with open_text(path) as source:
+            batch = {}
+            for url in iter_seed_urls(source):
+                read += 1
+                batch.setdefault(url, urlparse(url).netloc)
+                if len(batch) >= batch_size:
+                    inserted += _write_batch(cursor, query, list(batch.items()))
+                    conn.commit()
+                    batch = {}
+                    logger.info("Seed içe aktarma: %s URL okundu, %s yeni", read, inserted)
+            if batch:
+                inserted += _write_batch(cursor, query, list(batch.items()))
+                conn.commit()
+
+        logger.info("Seed içe aktarma tamamlandı: %s geçerli URL, %s yeni eklendi", read, inserted)
+        return read, inserted
+    except Exception as e:
+        logger.error("Seed içe aktarma hatası: %s", e, exc_info=True)
+        if conn:
+            conn.rollback()
+        return read, inserted
+    finally:
+        if conn:
+            conn.close()
+
+def _format_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).replace('\t', ' ').replace('\n', ' ')
+
+def export_frontier(path, batch_size=FRONTIER_IO_BATCH_SIZE):
+    conn = None
+    exported = 0
+    try:
+        conn = mysql_handler.get_connection()
+        cursor = conn.cursor()
+
+        with open_text(path, 'wt') as target:
+            target.write(CHECKPOINT_HEADER + '\t' + '\t'.join(CHECKPOINT_COLUMNS) + '\n')
+
+            last_id = 0
+            while True:
+                # OFFSET yerine id keyset; her parti kısa ve bağımsız bir sorgu
+                cursor.execute(f"""
+                    SELECT id, {', '.join(CHECKPOINT_COLUMNS)}
+                    FROM bots
+                    WHERE id > %s
+                    ORDER BY id
+                    LIMIT %s
+                """, (last_id, batch_size))
+                rows = cursor.fetchall()
+                conn.commit()
+                if not rows:
+                    break
+
+                target.writelines('\t'.join(_format_value(value) for value in row[1:]) + '\n' for row in rows)
+                last_id = rows[-1][0]
+                exported += len(rows)
+
+        logger.info("Frontier dışa aktarıldı: %s URL -> %s", exported, path)
+        return exported
+    except Exception as e:
+        logger.error("Frontier dışa aktarma hatası: %s", e, exc_info=True)
+        return exported
+    finally:
+        if conn:
+            conn.close()
+
+def _parse_value(column, value):
+    if value == '':
+        return None
+    if column in DATETIME_COLUMNS:
+        return datetime.fromisoformat(value)
+    if column in INT_COLUMNS:
+        return int(value)
+    if column == 'priority':
+        return float(value)
+    return value
+
+def restore_frontier(path, batch_size=FRONTIER_IO_BATCH_SIZE):
+    conn = None
+    restored = 0
+    try:
+        conn = mysql_handler.get_connection()
+        cursor = conn.cursor()
+
+        with open_text(path) as source:
+            header = source.readline().rstrip('\n').split('\t')
+            if header[0] != CHECKPOINT_HEADER:
+                raise ValueError(f"Geçersiz frontier dosyası: {path}")
+            columns = [column for column in header[1:] if column in CHECKPOINT_COLUMNS]
+            if 'url' not in columns:
+                raise ValueError(f"Frontier dosyasında url sütunu yok: {path}")
+            positions = [header[1:].index(column) for column in columns]
+
+            updates = ', '.join(f"{column} = VALUES({column})" for column in columns if column != 'url') or "url = url"
+            query = f"""
+                INSERT INTO bots ({', '.join(columns)})
+                VALUES ({', '.join(['%s'] * len(columns))})
+                ON DUPLICATE KEY UPDATE {updates}
+            """
+
+            batch = []
+            for line in source:
+                values = line.rstrip('\n').split('\t')
+                batch.append(tuple(
+                    _parse_value(column, values[position] if position < len(values) else '')
+                    for column, position in zip(columns, positions)
+                ))
+                if len(batch) >= batch_size:
+                    _write_batch(cursor, query, batch)
+                    conn.commit()
+                    restored += len(batch)
+                    batch = []
+                    logger.info("Frontier geri yükleme: %s URL", restored)
+            if batch:
+                _write_batch(cursor, query, batch)
+                conn.commit()
+                restored += len(batch)
+
+        logger.info("Frontier geri yüklendi: %s URL <- %s", restored, path)
+        return restored
+    except Exception as e:
+        logger.error("Frontier geri yükleme hatası: %s", e, exc_info=True)
+        if conn:
+            conn.rollback()
+        return restored
+    finally:
+        if conn:
+            conn.close()
@@ -0,0 +1,176 @@
+import sqlite3
+import mysql.connector
+from datetime import datetime
+from utils.logger import logger
+from utils.config import SQLITE_DB_PATH, WHITELISTED_DOMAINS
+from database import mysql_handler, search_index
+
+# Sürüm tablosundan önce elle eklenmiş olabilecek nesneler için yok sayılan hatalar
+IGNORED_MYSQL_ERRORS = {
+    1050,  # Table already exists
+    1060,  # Duplicate column name
+    1061,  # Duplicate key name
+}
+
+MYSQL_MIGRATIONS = [
+    (1, "Temel tablolar", [
+        """
+        CREATE TABLE IF NOT EXISTS bots (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            url VARCHAR(2048) NOT NULL UNIQUE,
+            in_progress BOOLEAN NOT NULL DEFAULT 0,
+            visited BOOLEAN NOT NULL DEFAULT 0,
+            error_count INT NOT NULL DEFAULT 0,
+            last_crawled DATETIME,
+            last_error DATETIME,
+            domain VARCHAR(255)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS domain_counters (
+            domain VARCHAR(255) NOT NULL PRIMARY KEY,
+            count INT NOT NULL DEFAULT 0,
+            last_updated DATE NOT NULL,
+            is_whitelisted BOOLEAN DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS error_logs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            url VARCHAR(2048),
+            error_type VARCHAR(255),
+            error_message TEXT,
+            timestamp DATETIME
+        )
+        """
+    ]),
+    (2, "bots.domain sütunu ve eski kayıtların doldurulması", [
+        "ALTER TABLE bots ADD COLUMN domain VARCHAR(255)",
+        """
+        UPDATE bots
+        SET domain = SUBSTRING_INDEX(SUBSTRING_INDEX(url, '://', -1), '/', 1)
+        WHERE domain IS NULL
+        """
+    ]),
+    (3, "Whitelist domain sayaçlarının işaretlenmesi", [
+        (
+            """
+            UPDATE domain_counters
+            SET is_whitelisted = 1
+            WHERE domain LIKE %s
+            """,
+            (f'%{domain_ext}',)
+        )
+        for domain_ext in WHITELISTED_DOMAINS
+    ]),
+    (4, "Adaptif tekrar tarama sütunları", [
+        "ALTER TABLE bots ADD COLUMN content_hash CHAR(16)",
+        "ALTER TABLE bots ADD COLUMN check_count INT NOT NULL DEFAULT 0",
+        "ALTER TABLE bots ADD COLUMN change_count INT NOT NULL DEFAULT 0",
+        "ALTER TABLE bots ADD COLUMN observed_seconds BIGINT NOT NULL DEFAULT 0",
+        "ALTER TABLE bots ADD COLUMN next_fetch_at DATETIME",
+        "CREATE INDEX idx_bots_next_fetch ON bots (next_fetch_at)"
+    ]),
+    (5, "Frontier öncelik sütunu", [
+        "ALTER TABLE bots ADD COLUMN priority FLOAT NOT NULL DEFAULT 0"
+    ]),
+]
+
+def _add_pages_simhash(conn):
+    try:
+        conn.execute("ALTER TABLE pages ADD COLUMN simhash INTEGER")
+    except sqlite3.OperationalError as err:
+        if "duplicate column" not in str(err):
+            raise
+
+def _add_pages_change_seq(conn):
+    # Her ekleme/güncellemede artan sıra; dışa aktarma id yerine buna göre ilerler
+    try:
+        conn.execute("ALTER TABLE pages ADD COLUMN change_seq INTEGER")
+    except sqlite3.OperationalError as err:
+        if "duplicate column" not in str(err):
+            raise
+    conn.execute("UPDATE pages SET change_seq = id WHERE change_seq IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_change_seq ON pages (change_seq, id)")
+
+def _mark_simhash_backfill(conn):
+    # Hesaplama burada yapılmaz: kısmi indeks bekleyen sayfaları işaretler,
+    # near_duplicates.backfill arka plan işi bunları partiler halinde doldurur
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_simhash_pending ON pages (id) WHERE simhash IS NULL")
+
+SQLITE_MIGRATIONS = [
+    (1, "pages tablosu", lambda conn: conn.execute("""
+        CREATE TABLE IF NOT EXISTS pages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE,
+            title TEXT,
+            content TEXT,
+            language TEXT,
+            timestamp TEXT,
+            analyzed BOOLEAN DEFAULT 0
+        )
+    """)),
+    (2, "pages.simhash sütunu", _add_pages_simhash),
+    (3, "Tam metin arama indeksi", search_index.init_search_index),
+    (4, "pages.change_seq sütunu", _add_pages_change_seq),
+    (5, "Eski sayfalar için SimHash backfill işareti", _mark_simhash_backfill),
+]
+
+def migrate_mysql():
+    conn = None
+    try:
+        conn = mysql_handler.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT NOT NULL PRIMARY KEY,
+                description VARCHAR(255),
+                applied_at DATETIME
+            )
+        """)
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        current = cursor.fetchone()[0]
+
+        pending = [migration for migration in MYSQL_MIGRATIONS if migration[0] > current]
+        for version, description, statements in pending:
+            logger.info("MySQL migration %s uygulanıyor: %s", version, description)
+            for statement in statements:
+                sql, params = statement if isinstance(statement, tuple) else (statement, None)
+                try:
+                    cursor.execute(sql, params)
+                except mysql.connector.Error as err:
+                    if err.errno not in IGNORED_MYSQL_ERRORS:
+                        raise
+            cursor.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (%s, %s, %s)",
+                (version, description, datetime.utcnow())
+            )
+            conn.commit()
+
+        latest = pending[-1][0] if pending else current
+        logger.info("MySQL şema sürümü: %s (%s migration uygulandı)", latest, len(pending))
+        return latest
+    finally:
+        if conn:
+            conn.close()
+
+def migrate_sqlite():
+    conn = None
+    try:
+        conn = sqlite3.connect(SQLITE_DB_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode = WAL")
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        pending = [migration for migration in SQLITE_MIGRATIONS if migration[0] > current]
+        for version, description, apply in pending:
+            logger.info("SQLite migration %s uygulanıyor: %s", version, description)
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+
+        latest = pending[-1][0] if pending else current
+        logger.info("SQLite şema sürümü: %s (%s migration uygulandı)", latest, len(pending))
+        return latest
+    finally:
+        if conn:
+            conn.close()
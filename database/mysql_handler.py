@@ -2,64 +2,113 @@ import mysql.connector
 from mysql.connector import pooling, errors
 from datetime import datetime
 from utils.logger import logger
-from utils.config import MYSQL_CONFIG, MAX_ERROR_COUNT, PRIORITY_DOMAINS, PRIORITY_INTERVAL, WHITELISTED_DOMAINS, DOMAIN_LIMIT, SQLITE_DB_PATH
+from utils.config import (
+    MYSQL_CONFIG, MAX_ERROR_COUNT, DOMAIN_LIMIT, PRIORITY_DOMAINS, PRIORITY_INTERVAL, SQLITE_DB_PATH,
+    PAGERANK_UPDATE_CHUNK, RECRAWL_MIN_INTERVAL, RECRAWL_MAX_INTERVAL
+)
 from urllib.parse import urlparse
 import sqlite3
 import sys
+import threading
 from utils.helpers import is_valid_link 
 from utils.helpers import normalize_url
 
 
-# MySQL Connection Pool
-try:
-    mysql_pool = pooling.MySQLConnectionPool(
-        pool_name="aysearch_pool",
-        pool_size=10,
-        **MYSQL_CONFIG
+# MySQL Connection Pool (ilk kullanımda oluşturulur)
+mysql_pool = None
+pool_lock = threading.Lock()
+
+def get_pool():
+    global mysql_pool
+    if mysql_pool is None:
+        with pool_lock:
+            if mysql_pool is None:
+                try:
+                    mysql_pool = pooling.MySQLConnectionPool(
+                        pool_name="aysearch_pool",
+                        pool_size=10,
+                        **MYSQL_CONFIG
+                    )
+                    logger.info("MySQL bağlantı havuzu başarıyla oluşturuldu")
+                except Exception as e:
+                    logger.critical("MySQL bağlantı havuzu oluşturulamadı: %s", e)
+                    sys.exit(1)
+    return mysql_pool
+
+def get_connection():
+    return get_pool().get_connection()
+
+def frontier_query(columns, limit, exclude_domains=(), lock=True):
+    # Claim ve DNS ön çözümleme aynı koşul ve sıralamayı kullanır
+    priority_domains = PRIORITY_DOMAINS
+    priority_interval = PRIORITY_INTERVAL
+    
+    query = """
+        SELECT %s
+        FROM bots b
+        WHERE 
+            (
+                (b.visited = 1 AND b.in_progress = 0 AND b.next_fetch_at <= %s)
+                OR 
+                (b.visited = 1 AND b.in_progress = 0 AND b.next_fetch_at IS NULL
+                AND b.domain IN (%s) 
+                AND b.last_crawled < NOW() - INTERVAL %s SECOND)
+                OR 
+                (b.visited = 0 AND b.in_progress = 0)
+            )
+            AND (b.error_count < %s OR b.error_count IS NULL)
+            AND NOT EXISTS (
+                SELECT 1 FROM domain_counters dc
+                WHERE dc.domain = b.domain
+                    AND dc.last_updated = UTC_DATE()
+                    AND dc.count >= %s
+                    AND dc.is_whitelisted = 0
+            )
+            %s
+        ORDER BY 
+            b.domain IN (%s) DESC,
+            b.priority DESC,
+            b.last_crawled ASC,
+            b.id ASC 
+        LIMIT %s
+        %s
+    """
+    
+    # Günlük limitini dolduran domainler domain_counters üzerinden elenir (kesin kontrol
+    # try_acquire'da); burada yalnızca devresi açık hostlar parametre olarak geçer
+    exclude_domains = list(exclude_domains)
+    exclude_clause = ''
+    if exclude_domains:
+        exclude_clause = f"AND (b.domain IS NULL OR b.domain NOT IN ({', '.join(['%s'] * len(exclude_domains))}))"
+    
+    domain_placeholders = ', '.join(['%s'] * len(priority_domains))
+    query = query % (
+        columns, '%s', domain_placeholders, '%s', '%s', '%s', exclude_clause, domain_placeholders, '%s',
+        'FOR UPDATE SKIP LOCKED' if lock else ''
     )
-    logger.info("MySQL bağlantı havuzu başarıyla oluşturuldu")
-except Exception as e:
-    logger.critical(f"MySQL bağlantı havuzu oluşturulamadı: {str(e)}")
-    sys.exit(1)
+    params = (
+        datetime.utcnow(),
+        *priority_domains, 
+        priority_interval,
+        MAX_ERROR_COUNT,
+        DOMAIN_LIMIT,
+        *exclude_domains,
+        *priority_domains,
+        limit
+    )
+    return query, params
 
-def get_unvisited_links(limit=5):
+def get_unvisited_links(limit=5, exclude_domains=()):
     conn = None
     try:
-        conn = mysql_pool.get_connection()
+        conn = get_connection()
         cursor = conn.cursor(dictionary=True, buffered=True)
         
         conn.start_transaction()
         
-        priority_domains = PRIORITY_DOMAINS
-        priority_interval = PRIORITY_INTERVAL
-        
-        query = """
-            SELECT b.id, b.url 
-            FROM bots b
-            WHERE 
-                (
-                    (b.visited = 1 AND b.domain IN (%s) 
-                    AND b.last_crawled < NOW() - INTERVAL %s SECOND)
-                    OR 
-                    (b.visited = 0 AND b.in_progress = 0)
-                )
-                AND (b.error_count < %s OR b.error_count IS NULL)
-            ORDER BY 
-                b.domain IN (%s) DESC,
-                b.last_crawled ASC,
-                b.id ASC 
-            LIMIT %s
-            FOR UPDATE SKIP LOCKED
-        """
-        
-        domain_placeholders = ', '.join(['%s'] * len(priority_domains))
-        query = query % (domain_placeholders, '%s', '%s', domain_placeholders, '%s')
-        params = (
-            *priority_domains, 
-            priority_interval,
-            MAX_ERROR_COUNT,
-            *priority_domains,
-            limit
+        query, params = frontier_query(
+            "b.id, b.url, b.last_crawled, b.content_hash, b.check_count, b.change_count, b.observed_seconds",
+            limit, exclude_domains
         )
         
         cursor.execute(query, params)
@@ -84,12 +133,12 @@ def get_unvisited_links(limit=5):
         return results
         
     except mysql.connector.Error as err:
-        logger.error(f"MySQL get_links hatası: {err}", exc_info=True)
+        logger.error("MySQL get_links hatası: %s", err, exc_info=True)
         if conn:
             conn.rollback()
         return []
     except Exception as e:
-        logger.error(f"Genel get_links hatası: {str(e)}", exc_info=True)
+        logger.error("Genel get_links hatası: %s", e, exc_info=True)
         if conn:
             conn.rollback()
         return []
@@ -97,6 +146,21 @@ def get_unvisited_links(limit=5):
         if conn:
             conn.close()
 
+def peek_frontier_domains(limit, exclude_domains=()):
+    # Claim sorgusunun kilitsiz hali: sıradaki URL'lerin hostları DNS önbelleğine önceden alınır
+    conn = None
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(*frontier_query("b.domain", limit, exclude_domains, lock=False))
+        return list(dict.fromkeys(row[0] for row in cursor.fetchall() if row[0]))
+    except Exception as e:
+        logger.error("Frontier domain okuma hatası: %s", e, exc_info=True)
+        return []
+    finally:
+        if conn:
+            conn.close()
+
 def insert_links_bulk(links):
     if not links:
         return
@@ -105,7 +169,7 @@ def insert_links_bulk(links):
     sqlite_conn = None
     try:
         normalized_links = list({normalize_url(link) for link in links if is_valid_link(link)})
-        logger.info(f"{len(normalized_links)} geçerli link bulundu")
+        logger.info("%s geçerli link bulundu", len(normalized_links))
         if not normalized_links:
             return
 
@@ -124,7 +188,7 @@ def insert_links_bulk(links):
             logger.info("Tüm linkler zaten SQLite'ta kayıtlı")
             return
 
-        conn = mysql_pool.get_connection()
+        conn = get_connection()
         conn.start_transaction()
         cursor = conn.cursor()
 
@@ -146,7 +210,7 @@ def insert_links_bulk(links):
             conn.commit()
             return
 
-        logger.info(f"MySQL'e eklenecek yeni link sayısı: {len(final_links)}")
+        logger.info("MySQL'e eklenecek yeni link sayısı: %s", len(final_links))
         insert_query = "INSERT IGNORE INTO bots (url, in_progress, visited, domain) VALUES (%s, 0, 0, %s)"
         
         batch_data = []
@@ -166,14 +230,14 @@ def insert_links_bulk(links):
                         pass
             
         conn.commit()
-        logger.info(f"MySQL'e toplam {len(final_links)} yeni link eklendi")
+        logger.info("MySQL'e toplam %s yeni link eklendi", len(final_links))
         
     except mysql.connector.Error as err:
-        logger.error(f"MySQL insert_links_bulk() hatası: {err}", exc_info=True)
+        logger.error("MySQL insert_links_bulk() hatası: %s", err, exc_info=True)
         if conn:
             conn.rollback()
     except Exception as e:
-        logger.error(f"Genel insert_links_bulk() hatası: {str(e)}", exc_info=True)
+        logger.error("Genel insert_links_bulk() hatası: %s", e, exc_info=True)
         if conn:
             conn.rollback()
     finally:
@@ -182,22 +246,161 @@ def insert_links_bulk(links):
         if sqlite_conn:
             sqlite_conn.close()
 
-def mark_link_visited(link_id):
+def get_link_ids(links):
+    if not links:
+        return {}
+
+    conn = None
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        link_ids = {}
+        links = list(links)
+        batch_size = 500
+        for i in range(0, len(links), batch_size):
+            batch = links[i:i + batch_size]
+            cursor.execute(f"""
+                SELECT id, url 
+                FROM bots 
+                WHERE url IN ({', '.join(['%s'] * len(batch))})
+            """, tuple(batch))
+            link_ids.update((row[1], row[0]) for row in cursor.fetchall())
+        return link_ids
+    except Exception as e:
+        logger.error("Link id sorgu hatası: %s", e, exc_info=True)
+        return {}
+    finally:
+        if conn:
+            conn.close()
+
+def update_priorities(scores, batch_size=10000, chunk_size=PAGERANK_UPDATE_CHUNK):
+    conn = None
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TEMPORARY TABLE IF NOT EXISTS frontier_scores (
+                id INT NOT NULL PRIMARY KEY,
+                score FLOAT NOT NULL
+            )
+        """)
+        cursor.execute("TRUNCATE TABLE frontier_scores")
+        
+        # executemany çok satırlı INSERT'e dönüştürülür; satır satır UPDATE yerine tek JOIN
+        batch = []
+        for row in scores:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                cursor.executemany("INSERT INTO frontier_scores (id, score) VALUES (%s, %s)", batch)
+                batch = []
+        if batch:
+            cursor.executemany("INSERT INTO frontier_scores (id, score) VALUES (%s, %s)", batch)
+        conn.commit()
+        
+        cursor.execute("SELECT MIN(id), MAX(id) FROM frontier_scores")
+        first_id, last_id = cursor.fetchone()
+        
+        # Küçük id aralıkları ayrı işlemlerde güncellenir; satır kilitleri claim ve
+        # mark_link_* sorgularını tüm çalışma boyunca bekletmez
+        updated = 0
+        for start in range(first_id or 0, (last_id or -1) + 1, chunk_size):
+            cursor.execute("""
+                UPDATE bots b
+                JOIN frontier_scores s ON s.id = b.id
+                SET b.priority = s.score
+                WHERE b.id BETWEEN %s AND %s
+            """, (start, start + chunk_size - 1))
+            updated += max(cursor.rowcount, 0)
+            conn.commit()
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS frontier_scores")
+        logger.debug("%s URL önceliği güncellendi", updated)
+    except Exception as e:
+        logger.error("Öncelik güncelleme hatası: %s", e, exc_info=True)
+        if conn:
+            conn.rollback()
+    finally:
+        if conn:
+            conn.close()
+
+def insert_error_logs(events):
+    if not events:
+        return True
+
+    conn = None
+    try:
+        conn = get_connection()
+        conn.start_transaction()
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO error_logs (url, error_type, error_message, timestamp)
+            VALUES (%s, %s, %s, %s)
+        """, events)
+        conn.commit()
+        return True
+    except Exception as e:
+        logger.error("Hata kaydı yazma hatası: %s", e, exc_info=True)
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+def release_links(link_ids):
+    if not link_ids:
+        return
+
     conn = None
     try:
-        conn = mysql_pool.get_connection()
+        conn = get_connection()
+        conn.start_transaction()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            UPDATE bots 
+            SET in_progress = 0 
+            WHERE id IN ({', '.join(['%s'] * len(link_ids))})
+        """, tuple(link_ids))
+        conn.commit()
+    except Exception as e:
+        logger.error("Link serbest bırakma hatası: %s", e, exc_info=True)
+        if conn:
+            conn.rollback()
+    finally:
+        if conn:
+            conn.close()
+
+def mark_link_visited(link_id, schedule=None):
+    conn = None
+    try:
+        schedule = schedule or {}
+        conn = get_connection()
         conn.start_transaction()
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE bots 
             SET visited = 1, 
                 in_progress = 0, 
-                last_crawled = %s 
+                error_count = 0,
+                last_crawled = %s,
+                content_hash = COALESCE(%s, content_hash),
+                check_count = COALESCE(%s, check_count),
+                change_count = COALESCE(%s, change_count),
+                observed_seconds = COALESCE(%s, observed_seconds),
+                next_fetch_at = %s
             WHERE id = %s
-        """, (datetime.utcnow().isoformat(), link_id))
+        """, (
+            datetime.utcnow().isoformat(),
+            schedule.get('content_hash'),
+            schedule.get('check_count'),
+            schedule.get('change_count'),
+            schedule.get('observed_seconds'),
+            schedule.get('next_fetch_at'),
+            link_id
+        ))
         conn.commit()
     except Exception as e:
-        logger.error(f"İşaretleme hatası: {str(e)}", exc_info=True)
+        logger.error("İşaretleme hatası: %s", e, exc_info=True)
         if conn:
             conn.rollback()
     finally:
@@ -207,77 +410,79 @@ def mark_link_visited(link_id):
 def mark_link_error(link_id):
     conn = None
     try:
-        conn = mysql_pool.get_connection()
+        # Başarısız tekrar taramada next_fetch_at ileri itilir; aksi halde satır hemen tekrar claim edilir
+        now = datetime.utcnow()
+        conn = get_connection()
         conn.start_transaction()
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE bots 
             SET in_progress = 0, 
+                next_fetch_at = CASE
+                    WHEN visited = 1 THEN %s + INTERVAL LEAST(%s, %s * POW(2, error_count)) SECOND
+                    ELSE next_fetch_at
+                END,
                 error_count = error_count + 1,
                 last_error = %s 
             WHERE id = %s
-        """, (datetime.utcnow().isoformat(), link_id))
+        """, (now, RECRAWL_MAX_INTERVAL, RECRAWL_MIN_INTERVAL, now, link_id))
         conn.commit()
         
         cursor.execute("SELECT error_count FROM bots WHERE id = %s", (link_id,))
         error_count = cursor.fetchone()[0]
         if error_count >= MAX_ERROR_COUNT:
-            logger.warning(f"URL blacklist'e alındı (ID: {link_id})")
+            logger.warning("URL blacklist'e alındı (ID: %s)", link_id)
     except Exception as e:
-        logger.error(f"Hata işaretleme hatası: {str(e)}", exc_info=True)
+        logger.error("Hata işaretleme hatası: %s", e, exc_info=True)
         if conn:
             conn.rollback()
     finally:
         if conn:
             conn.close()
 
-def update_domain_counter(domain):
+def load_domain_counters():
     conn = None
     try:
-        is_whitelisted = any(domain.endswith(ext) for ext in WHITELISTED_DOMAINS)
-        
-        conn = mysql_pool.get_connection()
-        conn.start_transaction()
+        conn = get_connection()
         cursor = conn.cursor()
-        
-        today = datetime.utcnow().date()
-        
         cursor.execute("""
-            SELECT count, last_updated 
+            SELECT domain, count, last_updated 
             FROM domain_counters 
-            WHERE domain = %s
-            FOR UPDATE
-        """, (domain,))
-        result = cursor.fetchone()
-        
-        if result:
-            count, last_updated = result
-            if last_updated < today and not is_whitelisted:
-                count = 0
-        else:
-            count = 0
-        
-        if not is_whitelisted and count >= DOMAIN_LIMIT:
-            conn.commit()
-            return count, is_whitelisted
-        
-        count += 1
-        cursor.execute("""
+            WHERE last_updated >= %s
+        """, (datetime.utcnow().date(),))
+        return cursor.fetchall()
+    except Exception as e:
+        logger.error("Domain sayaç yükleme hatası: %s", e, exc_info=True)
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+def flush_domain_counters(rows):
+    if not rows:
+        return True
+
+    conn = None
+    try:
+        conn = get_connection()
+        conn.start_transaction()
+        cursor = conn.cursor()
+        cursor.executemany("""
             INSERT INTO domain_counters (domain, count, last_updated, is_whitelisted)
             VALUES (%s, %s, %s, %s)
             ON DUPLICATE KEY UPDATE
                 count = VALUES(count),
                 last_updated = VALUES(last_updated),
                 is_whitelisted = VALUES(is_whitelisted)
-        """, (domain, count, today, is_whitelisted))
-        
+        """, rows)
         conn.commit()
-        return count, is_whitelisted
+        logger.debug("%s domain sayacı MySQL'e yazıldı", len(rows))
+        return True
     except Exception as e:
-        logger.error(f"Domain sayaç hatası: {str(e)}", exc_info=True)
+        logger.error("Domain sayaç yazma hatası: %s", e, exc_info=True)
         if conn:
             conn.rollback()
-        return 0, False
+        return False
     finally:
         if conn:
             conn.close()
\ No newline at end of file
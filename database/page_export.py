@@ -0,0 +1,147 @@
+import os
+import json
+import gzip
+import sqlite3
+from datetime import datetime
+from utils.logger import logger
+from utils.config import SQLITE_DB_PATH, PAGE_EXPORT_DIR, PAGE_EXPORT_BATCH_SIZE, PAGE_EXPORT_ROWS_PER_FILE
+
+EXPORT_COLUMNS = ['id', 'url', 'title', 'content', 'language', 'timestamp', 'change_seq']
+STATE_FILE = '_state.json'
+
+def load_state(directory):
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.exists(path):
+        return {'last_seq': 0, 'last_id': 0}
+    with open(path, encoding='utf-8') as source:
+        state = json.load(source)
+    # Eski durum dosyalarında yalnızca last_id vardır; migration change_seq'i id ile doldurur
+    state.setdefault('last_seq', state.get('last_id', 0))
+    return state
+
+def save_state(directory, state):
+    path = os.path.join(directory, STATE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as target:
+        json.dump(state, target)
+    os.replace(path + '.tmp', path)
+
+class JsonlWriter:
+    extension = '.jsonl.gz'
+
+    def __init__(self, path):
+        self.file = gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+
+    def write(self, rows):
+        self.file.writelines(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n' for row in rows
+        )
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    extension = '.parquet'
+
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([
+            ('id', pa.int64()),
+            ('url', pa.string()),
+            ('title', pa.string()),
+            ('content', pa.string()),
+            ('language', pa.string()),
+            ('timestamp', pa.string()),
+            ('change_seq', pa.int64())
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+
+    def write(self, rows):
+        # Her parti bir row group olarak yazılır
+        columns = list(zip(*rows))
+        self.writer.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema
+        ))
+
+    def close(self):
+        self.writer.close()
+
+WRITERS = {'jsonl': JsonlWriter, 'parquet': ParquetWriter}
+
+def export_pages(directory=PAGE_EXPORT_DIR, fmt='jsonl',
+                 batch_size=PAGE_EXPORT_BATCH_SIZE, rows_per_file=PAGE_EXPORT_ROWS_PER_FILE):
+    writer_class = WRITERS[fmt]
+    os.makedirs(directory, exist_ok=True)
+
+    state = load_state(directory)
+    last_seq = state['last_seq']
+    last_id = state.get('last_id', 0)
+    run_stamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+
+    conn = None
+    writer = None
+    part_path = None
+    file_rows = 0
+    exported = 0
+
+    def finish_file():
+        # Tüketiciler yalnızca tamamlanmış dosyaları görür; yüksek su işareti dosya kapanınca ilerler
+        nonlocal writer, part_path, file_rows
+        writer.close()
+        os.replace(part_path, part_path[:-len('.part')])
+        state['last_seq'] = last_seq
+        state['last_id'] = last_id
+        state['updated_at'] = datetime.utcnow().isoformat()
+        save_state(directory, state)
+        writer = None
+        part_path = None
+        file_rows = 0
+
+    try:
+        # isolation_level=None: her SELECT kendi kısa okuma işleminde çalışır, crawler yazımları beklemez
+        conn = sqlite3.connect(SQLITE_DB_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 30000")
+
+        while True:
+            rows = conn.execute(f"""
+                SELECT {', '.join(EXPORT_COLUMNS)}
+                FROM pages
+                WHERE (change_seq, id) > (?, ?)
+                ORDER BY change_seq, id
+                LIMIT ?
+            """, (last_seq, last_id, batch_size)).fetchall()
+            if not rows:
+                break
+
+            if writer is None:
+                # Dosya adı ilk satırın change_seq'i ile tekilleşir; aynı saniyedeki çalıştırmalar çakışmaz
+                part_path = os.path.join(directory, f"pages-{run_stamp}-{rows[0][-1]:012d}{writer_class.extension}.part")
+                writer = writer_class(part_path)
+
+            writer.write(rows)
+            # Güncellenen sayfalar yeni change_seq ile tekrar gelir; tüketici id başına en yüksek sırayı tutar
+            last_seq, last_id = rows[-1][-1], rows[-1][0]
+            file_rows += len(rows)
+            exported += len(rows)
+
+            if file_rows >= rows_per_file:
+                finish_file()
+
+        if writer is not None:
+            finish_file()
+
+        logger.info("Sayfa dışa aktarma tamamlandı: %s sayfa, son sıra %s", exported, last_seq)
+        return exported
+    except Exception as e:
+        logger.error("Sayfa dışa aktarma hatası: %s", e, exc_info=True)
+        if writer is not None:
+            writer.close()
+            os.remove(part_path)
+            exported -= file_rows
+        return exported
+    finally:
+        if conn:
+            conn.close()
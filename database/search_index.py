@@ -0,0 +1,105 @@
+import sqlite3
+from utils.logger import logger
+from utils.config import SQLITE_DB_PATH, INDEX_BATCH_SIZE
+
+def init_search_index(conn):
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+            title,
+            content,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    # İndekslenmemiş sayfaları id sırasıyla taramak için
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_analyzed ON pages (analyzed, id)")
+
+def index_pending(batch_size=INDEX_BATCH_SIZE, max_batches=None):
+    conn = None
+    total = 0
+    try:
+        conn = sqlite3.connect(SQLITE_DB_PATH, timeout=30)
+        conn.execute("PRAGMA busy_timeout = 30000")
+
+        last_id = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            rows = conn.execute("""
+                SELECT id, title, content, timestamp
+                FROM pages
+                WHERE analyzed = 0 AND id > ?
+                ORDER BY id
+                LIMIT ?
+            """, (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+
+            ids = [row[0] for row in rows]
+            with conn:
+                conn.execute(
+                    f"DELETE FROM pages_fts WHERE rowid IN ({', '.join(['?'] * len(ids))})",
+                    ids
+                )
+                conn.executemany(
+                    "INSERT INTO pages_fts (rowid, title, content) VALUES (?, ?, ?)",
+                    [(row[0], row[1] or '', row[2] or '') for row in rows]
+                )
+                # Bu arada crawler sayfayı güncellediyse analyzed=0 kalır, sonraki turda tekrar indekslenir
+                conn.executemany(
+                    "UPDATE pages SET analyzed = 1 WHERE id = ? AND timestamp IS ?",
+                    [(row[0], row[3]) for row in rows]
+                )
+
+            last_id = ids[-1]
+            total += len(rows)
+            batches += 1
+
+        if total:
+            logger.info("Arama indeksi güncellendi: %s sayfa", total)
+        return total
+    except Exception as e:
+        logger.error("Arama indeksi hatası: %s", e, exc_info=True)
+        return total
+    finally:
+        if conn:
+            conn.close()
+
+def build_match_query(query):
+    # Kullanıcı girdisi FTS5 sözdizimi olarak yorumlanmasın diye her terim tırnaklanır
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"' for term in terms if term)
+
+def search(query, limit=10, offset=0):
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    conn = None
+    try:
+        conn = sqlite3.connect(SQLITE_DB_PATH, timeout=30)
+        rows = conn.execute("""
+            SELECT p.id, p.url, p.title, p.language,
+                   snippet(pages_fts, 1, '[', ']', '...', 16),
+                   bm25(pages_fts, 5.0, 1.0) AS score
+            FROM pages_fts
+            JOIN pages p ON p.id = pages_fts.rowid
+            WHERE pages_fts MATCH ?
+            ORDER BY score
+            LIMIT ? OFFSET ?
+        """, (match, limit, offset)).fetchall()
+        return [
+            {
+                'id': row[0],
+                'url': row[1],
+                'title': row[2],
+                'language': row[3],
+                'snippet': row[4],
+                'score': -row[5]
+            }
+            for row in rows
+        ]
+    except Exception as e:
+        logger.error("Arama hatası: %s", e, exc_info=True)
+        return []
+    finally:
+        if conn:
+            conn.close()
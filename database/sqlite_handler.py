@@ -2,46 +2,37 @@ import sqlite3
 from utils.logger import logger
 from utils.config import SQLITE_DB_PATH
 
-def save_to_sqlite(url, title, text, lang, timestamp):
+def save_to_sqlite(url, title, text, lang, timestamp, simhash=None):
     conn = None
     try:
         conn = sqlite3.connect(SQLITE_DB_PATH, timeout=30)
         conn.execute("PRAGMA busy_timeout = 30000")
         cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT UNIQUE,
-                title TEXT,
-                content TEXT,
-                language TEXT,
-                timestamp TEXT,
-                analyzed BOOLEAN DEFAULT 0
-            )
-        ''')
-        
         cursor.execute("SELECT id FROM pages WHERE url = ?", (url,))
         existing = cursor.fetchone()
+        # Yazma kilidi altında hesaplandığı için change_seq her kayıtta kesin artar
+        next_seq = "(SELECT COALESCE(MAX(change_seq), 0) + 1 FROM pages)"
         
         if existing:
-            cursor.execute('''
+            cursor.execute(f'''
                 UPDATE pages 
-                SET title = ?, content = ?, language = ?, timestamp = ?, analyzed = 0
+                SET title = ?, content = ?, language = ?, timestamp = ?, analyzed = 0, simhash = ?,
+                    change_seq = {next_seq}
                 WHERE url = ?
-            ''', (title, text[:5000], lang, timestamp, url))
-            logger.debug(f"SQLite güncellendi: {url}")
+            ''', (title, text[:5000], lang, timestamp, simhash, url))
+            logger.debug("SQLite güncellendi: %s", url)
         else:
-            cursor.execute('''
-                INSERT INTO pages (url, title, content, language, timestamp, analyzed) 
-                VALUES (?, ?, ?, ?, ?, 0)
-            ''', (url, title, text[:5000], lang, timestamp))
-            logger.debug(f"SQLite kaydedildi: {url}")
+            cursor.execute(f'''
+                INSERT INTO pages (url, title, content, language, timestamp, analyzed, simhash, change_seq) 
+                VALUES (?, ?, ?, ?, ?, 0, ?, {next_seq})
+            ''', (url, title, text[:5000], lang, timestamp, simhash))
+            logger.debug("SQLite kaydedildi: %s", url)
             
         conn.commit()
     except sqlite3.IntegrityError:
-        logger.warning(f"SQLite IntegrityError: {url}")
+        logger.warning("SQLite IntegrityError: %s", url)
     except Exception as e:
-        logger.error(f"SQLite kayıt hatası: {str(e)}", exc_info=True)
+        logger.error("SQLite kayıt hatası: %s", e, exc_info=True)
         if conn:
             conn.rollback()
     finally:
@@ -22,6 +22,9 @@ MYSQL_CONFIG = {
 
 SQLITE_DB_PATH = 'data/ayfilter_data.db'
 LOG_PATH = 'data/aybot_crawler.log'
+LOG_FORMAT = os.getenv('AYBOT_LOG_FORMAT', 'text')  # text | json
+LOG_RATE_LIMIT = 20  # Aynı INFO mesaj şablonu için pencere başına en fazla kayıt (0 = sınırsız)
+LOG_RATE_WINDOW = 10
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 13_5_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.5 Safari/605.1.15',
@@ -33,14 +36,82 @@ USER_AGENTS = [
 SPAM_KEYWORDS = ['xxx', 'viagra', 'casino', 'porn', 'adult']
 SKIP_EXTENSIONS = re.compile(r'\.(jpg|jpeg|png|gif|pdf|zip|rar|exe|mp4|mp3|avi|wmv|svg|css|js|woff2?|ico)$', re.IGNORECASE)
 DOMAIN_LIMIT = 50
+DOMAIN_COUNTER_FLUSH_INTERVAL = 30
 MAX_CONCURRENT_REQUESTS = 5
 REQUEST_TIMEOUT = 20
 ROBOTS_TIMEOUT = 3
 JS_RENDER_THRESHOLD = 3
 MIN_CONTENT_LENGTH = 50
 MAX_ERROR_COUNT = 3
+FRONTIER_IO_BATCH_SIZE = 5000
+
+# HTTP bağlantı havuzu ve paylaşılan DNS önbelleği
+HTTP_CONNECTION_LIMIT = 100
+HTTP_LIMIT_PER_HOST = 5
+HTTP_KEEPALIVE_TIMEOUT = 30
+DNS_CACHE_DEFAULT_TTL = 300
+DNS_CACHE_MIN_TTL = 30
+DNS_CACHE_MAX_TTL = 3600
+DNS_NEGATIVE_TTL = 300
+DNS_CACHE_MAX_ENTRIES = 50000
+DNS_PREFETCH_INTERVAL = 60
+DNS_PREFETCH_LIMIT = 500
+DNS_PREFETCH_CONCURRENCY = 20
+
+# Gecikmeli yeniden deneme kuyruğu
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 5
+RETRY_MAX_DELAY = 300
+RETRY_AFTER_MAX = 3600
+
+# Host bazlı devre kesici ve hata kayıtları
+CIRCUIT_WINDOW = 20
+CIRCUIT_WINDOW_SECONDS = 600
+CIRCUIT_MIN_REQUESTS = 5
+CIRCUIT_ERROR_RATE = 0.5
+CIRCUIT_TIMEOUT_THRESHOLD = 3
+CIRCUIT_COOLDOWN = 300
+CIRCUIT_MAX_COOLDOWN = 3600
+ERROR_LOG_FLUSH_INTERVAL = 30
+ERROR_LOG_BUFFER_MAX = 5000
+
+# Yakın kopya (SimHash) tespiti
+SIMHASH_BANDS = 4
+SIMHASH_MAX_DISTANCE = 3
+SIMHASH_SHINGLE_SIZE = 3
+SIMHASH_MAX_CHARS = 5000
+SIMHASH_BACKFILL_BATCH_SIZE = 200
+SIMHASH_BACKFILL_INTERVAL = 10
+
+# Ham yanıt arşivi (WARC benzeri capture segmentleri)
+CAPTURE_ENABLED = os.getenv('AYBOT_CAPTURE', '0') == '1'
+CAPTURE_DIR = 'data/capture'
+CAPTURE_SEGMENT_MAX_BYTES = 512 * 1024 * 1024
+
+# Tam metin arama indeksi
+INDEX_BATCH_SIZE = 500
+INDEX_INTERVAL = 60
+
+# Link grafı ve PageRank
+LINK_GRAPH_DIR = 'data/graph'
+LINK_GRAPH_SEGMENT_MAX_BYTES = 256 * 1024 * 1024
+LINK_GRAPH_BUFFER_EDGES = 50000
+LINK_GRAPH_FLUSH_INTERVAL = 60
+PAGERANK_INTERVAL = 3600
+PAGERANK_DAMPING = 0.85
+PAGERANK_MAX_ITERATIONS = 50
+PAGERANK_TOLERANCE = 1e-6
+PAGERANK_UPDATE_CHUNK = 5000
+
+# Sayfa dışa aktarma
+PAGE_EXPORT_DIR = 'data/export'
+PAGE_EXPORT_BATCH_SIZE = 1000
+PAGE_EXPORT_ROWS_PER_FILE = 100000
 
 # Özel domain ayarları
 PRIORITY_DOMAINS = ['haberler.com']
 PRIORITY_INTERVAL = 48 * 3600
+RECRAWL_MIN_INTERVAL = 6 * 3600
+RECRAWL_MAX_INTERVAL = 30 * 24 * 3600
+RECRAWL_DEFAULT_INTERVAL = 7 * 24 * 3600
 WHITELISTED_DOMAINS = ['gov.tr', 'edu.tr', 'tbb.org.tr', 'gov', 'edu']
\ No newline at end of file
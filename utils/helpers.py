@@ -1,10 +1,24 @@
 import re
 from urllib.parse import urlparse, urljoin
-from langdetect import detect, DetectorFactory
 from .config import SPAM_KEYWORDS, SKIP_EXTENSIONS
 
-# Langdetect stabilizasyonu
-DetectorFactory.seed = 0
+_detect = None
+
+def detect_language(text):
+    # langdetect ve dil profilleri ilk ihtiyaçta yüklenir
+    global _detect
+    if _detect is None:
+        from langdetect import detect, DetectorFactory
+        # Langdetect stabilizasyonu
+        DetectorFactory.seed = 0
+        _detect = detect
+    
+    if not text or len(text) <= 100:
+        return 'unknown'
+    try:
+        return _detect(text[:500])
+    except Exception:
+        return 'unknown'
 
 def is_spam(text):
     if not text:
@@ -1,21 +1,92 @@
+import json
+import time
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-from .config import LOG_PATH
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from .config import LOG_PATH, LOG_FORMAT, LOG_RATE_LIMIT, LOG_RATE_WINDOW
 
-def setup_logger():
-    logger = logging.getLogger('AyBot')
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'line': record.lineno,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+class RateLimitFilter(logging.Filter):
+    # Aynı şablondan gelen INFO ve altı kayıtlar pencere başına `limit` ile sınırlanır,
+    # uyarı ve hatalar her zaman geçer
+    def __init__(self, limit=LOG_RATE_LIMIT, window=LOG_RATE_WINDOW):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.states = {}
+
+    def filter(self, record):
+        if record.levelno > logging.INFO or self.limit <= 0:
+            return True
+
+        now = time.monotonic()
+        state = self.states.get(record.msg)
+        if state is None or now - state[0] >= self.window:
+            suppressed = state[2] if state else 0
+            self.states[record.msg] = [now, 1, 0]
+            if suppressed and record.args and isinstance(record.args, tuple):
+                record.msg = f"{record.msg} (+%d benzer mesaj bastırıldı)"
+                record.args = record.args + (suppressed,)
+            return True
+
+        if state[1] < self.limit:
+            state[1] += 1
+            return True
+
+        state[2] += 1
+        return False
+
+class LazyQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Varsayılan prepare mesajı çağıran thread'de biçimlendirir; bu iş listener thread'ine bırakılır
+        return record
+
+listeners = []
+
+def shutdown_logging():
+    while listeners:
+        listeners.pop().stop()
+
+atexit.register(shutdown_logging)
+
+def setup_logger(name='AyBot', log_path=LOG_PATH, log_format=LOG_FORMAT, console=True):
+    logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
     
-    console_handler = logging.StreamHandler()
-    console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(console_formatter)
+    handlers = []
+    if console:
+        console_handler = logging.StreamHandler()
+        console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        console_handler.setFormatter(JsonFormatter() if log_format == 'json' else console_formatter)
+        handlers.append(console_handler)
     
-    file_handler = RotatingFileHandler(LOG_PATH, maxBytes=10*1024*1024, backupCount=2)
+    file_handler = RotatingFileHandler(log_path, maxBytes=10*1024*1024, backupCount=2)
     file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s')
-    file_handler.setFormatter(file_formatter)
+    file_handler.setFormatter(JsonFormatter() if log_format == 'json' else file_formatter)
+    handlers.append(file_handler)
+    
+    # Disk yazımı ve biçimlendirme arka plan thread'inde yapılır
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    listeners.append(listener)
     
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(LazyQueueHandler(log_queue))
+    logger.addFilter(RateLimitFilter())
     return logger
 
 logger = setup_logger()
\ No newline at end of file